@@ -0,0 +1,340 @@
+"""
+Замеры производительности всех методов библиотеки.
+
+Для каждого метода и размера задачи сохраняются время (лучшее из repeat запусков),
+пиковая память (tracemalloc), количество итераций/вычислений функции, если метод
+их сообщает, и погрешность относительно эталона NumPy.
+
+Запуск:
+    python benchmarks.py                              # вывести таблицу
+    python benchmarks.py --save baseline.json         # сохранить базовые замеры
+    python benchmarks.py --baseline baseline.json     # сравнить; код выхода 1, если
+                                                      # время выросло больше чем в --threshold раз
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+def _diagonally_dominant(n, rng):
+    A = rng.uniform(-1, 1, (n, n))
+    A += np.diag(np.abs(A).sum(axis=1) + 1)
+    return A, rng.uniform(-1, 1, n)
+
+
+def _symmetric(n, rng):
+    X = rng.standard_normal((n, n))
+    return (X + X.T) / 2
+
+
+def _gauss(method):
+    def case(n, rng):
+        gauss = importlib.import_module('gaus_simple_iteration')
+        A, b = _diagonally_dominant(n, rng)
+        reference = np.linalg.solve(A, b)
+        return (lambda: getattr(gauss, method)(A, b)), (lambda x: {'error': np.abs(x - reference).max()})
+    return case
+
+
+def _batch_solve(n, rng):
+    gauss = importlib.import_module('gaus_simple_iteration')
+    A = rng.standard_normal((n, 6, 6))
+    b = rng.standard_normal((n, 6))
+    reference = np.linalg.solve(A, b[..., None])[..., 0]
+
+    def check(result):
+        x, singular = result
+        return {'error': np.nanmax(np.abs(x - reference) / np.maximum(1, np.abs(reference))),
+                'singular': int(singular.sum())}
+    return (lambda: gauss.batch_solve(A, b)), check
+
+
+def _iterative(method):
+    def case(n, rng):
+        gauss = importlib.import_module('gaus_simple_iteration')
+        A, b = _diagonally_dominant(n, rng)
+        reference = np.linalg.solve(A, b)
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return getattr(gauss, method)(A, b, return_history=True)
+        return run, (lambda result: {'error': np.abs(result[0] - reference).max(), 'iterations': len(result[1])})
+    return case
+
+
+def _jacobi_rotation(ordering):
+    def case(n, rng):
+        rotation = importlib.import_module('rotation_method')
+        A = _symmetric(n, rng)
+        reference = np.linalg.eigvalsh(A)
+        run = lambda: rotation.jacobi_rotation(A, ordering=ordering, max_iterations=100 * n * n)
+        return run, (lambda result: {'error': np.abs(np.sort(result[0]) - reference).max()})
+    return case
+
+
+def _power_iteration(n, rng):
+    power = importlib.import_module('power_iteration_method')
+    X = rng.standard_normal((n, n))
+    A = X @ X.T
+    reference = np.linalg.eigvalsh(A)[-1]
+    run = lambda: power.power_iteration(A, num_iterations=1000, tol=1e-10, seed=0)
+    return run, (lambda result: {'error': abs(result[0] - reference) / reference})
+
+
+def _lanczos(n, rng):
+    power = importlib.import_module('power_iteration_method')
+    A = _symmetric(n, rng)
+    values = np.linalg.eigvalsh(A)
+    reference = np.sort(values[np.argsort(-np.abs(values))[:5]])
+    run = lambda: power.lanczos(A, 5, seed=0)
+    return run, (lambda result: {'error': np.abs(np.sort(result[0]) - reference).max()})
+
+
+def _find_eigenvectors(n, rng):
+    characteristic = importlib.import_module('сharacteristic_equation_method')
+    A = rng.standard_normal((n, n))
+    eigenvalues = np.linalg.eigvals(A)
+    run = lambda: characteristic.find_eigenvectors(A, eigenvalues)
+    return run, (lambda V: {'error': np.abs(A @ V.T - V.T * eigenvalues).max()})
+
+
+def _newton_function(method, args):
+    def case(n, rng):
+        newton = importlib.import_module('newton_method')
+        # n - степень полинома с корнями 1..n
+        F = newton.Function(np.poly(np.arange(1, n + 1)).tolist(), is_polynomial=True)
+
+        def run():
+            return getattr(F, method)(*args(n)), F.n_evaluations
+        return run, (lambda result: {'error': abs(F.evaluate(result[0])), 'evaluations': result[1]})
+    return case
+
+
+def _polynomial_roots(method):
+    def case(n, rng):
+        newton = importlib.import_module('newton_method')
+        # n кубических полиномов с известными корнями
+        roots = np.sort(rng.uniform(-5, 5, (n, 3)), axis=1)
+        coefficients = np.stack([np.poly(r) for r in roots])
+        run = lambda: newton.polynomial_roots(coefficients, method)
+        return run, (lambda result: {'error': np.abs(np.sort(result.real, axis=1) - roots).max()})
+    return case
+
+
+def _dih(n, rng):
+    dichotomy = importlib.import_module('dichotomy')
+    f = lambda x: math.sin(x) - 0.5
+    run = lambda: dichotomy.dih(f, 0.0, 1.5, eps=10.0 ** -n, full_output=True)
+    return run, (lambda result: {'error': abs(result[0] - math.pi / 6), 'iterations': result[1]})
+
+
+def _sqrt_a(n, rng):
+    simple = importlib.import_module('simple_iteration_method')
+    a = rng.uniform(0, 1e6, n)
+    run = lambda: simple.sqrt_a(a, return_result=True)
+    return run, (lambda result: {'error': np.abs(result.value - np.sqrt(a)).max(), 'iterations': result.iterations})
+
+
+def _fixed_point(method):
+    def case(n, rng):
+        simple = importlib.import_module('simple_iteration_method')
+        M = rng.standard_normal((n, n))
+        M = M + M.T
+        M *= 0.97 / np.abs(np.linalg.eigvalsh(M)).max()
+        c = rng.standard_normal(n)
+        reference = np.linalg.solve(np.eye(n) - M, c)
+        run = lambda: simple.fixed_point(lambda x: M @ x + c, np.zeros(n), method=method, max_iterations=5000,
+                                         return_result=True)
+        return run, (lambda result: {'error': np.abs(result.value - reference).max(),
+                                     'iterations': result.iterations})
+    return case
+
+
+def _find_all_roots(n, rng):
+    dichotomy = importlib.import_module('dichotomy')
+    # n корней sin(x) на (0.5, n pi + 0.5)
+    run = lambda: dichotomy.locate_roots(np.sin, 0.5, n * np.pi + 0.5, eps=1e-9, max_roots=n + 10)
+    reference = np.pi * np.arange(1, n + 1)
+
+    def check(result):
+        roots = result[0]
+        error = np.abs(roots - reference).max() if len(roots) == n else float('inf')
+        return {'error': error, 'evaluations': result[2]}
+    return run, check
+
+
+def _chebyshev_data(n, rng):
+    nodes = np.cos(np.pi * (np.arange(n) + 0.5) / n)
+    queries = rng.uniform(-1, 1, 10 ** 4)
+    return nodes, np.exp(nodes), queries
+
+
+def _lagrange(n, rng):
+    extrapolation = importlib.import_module('extropalation')
+    nodes, values, queries = _chebyshev_data(n, rng)
+    run = lambda: extrapolation.lagrange_interpolation(nodes, values, queries)
+    return run, (lambda result: {'error': np.abs(result - np.exp(queries)).max()})
+
+
+def _piecewise(kind):
+    def case(n, rng):
+        extrapolation = importlib.import_module('extropalation')
+        # n узлов таблицы, 10^6 запросов
+        nodes = np.sort(rng.uniform(0, 1, n))
+        queries = rng.uniform(nodes[0], nodes[-1], 10 ** 6)
+        run = lambda: extrapolation.piecewise_interpolation(nodes, np.sin(nodes), queries, kind)
+        return run, (lambda result: {'error': np.abs(result - np.sin(queries)).max()})
+    return case
+
+
+def _newton_interpolation(n, rng):
+    newton = importlib.import_module('newton_polinom')
+    nodes, values, queries = _chebyshev_data(n, rng)
+    run = lambda: newton.NewtonInterpolator(nodes, values)(queries)
+    return run, (lambda result: {'error': np.abs(result - np.exp(queries)).max()})
+
+
+def _chebyshev_approximation(n, rng):
+    newton = importlib.import_module('newton_polinom')
+    # Функция Рунге, n точек запроса
+    runge = lambda x: 1 / (1 + 25 * x ** 2)
+    queries = rng.uniform(-1, 1, n)
+    run = lambda: newton.ChebyshevApproximation(runge)(queries)
+    return run, (lambda result: {'error': np.abs(result - runge(queries)).max()})
+
+
+def _integral_smoothing(n, rng):
+    mnk = importlib.import_module('mnk')
+    x = rng.uniform(-1, 1, n)
+    y = 1 + 2 * x - x ** 3 + 0.01 * rng.standard_normal(n)
+    queries = np.linspace(-1, 1, 101)
+    reference = np.polyval(np.polyfit(x, y, 3), queries)
+    run = lambda: mnk.integral_smoothing(x, y, 3, queries)
+    return run, (lambda result: {'error': np.abs(result - reference).max()})
+
+
+# Название -> (функция подготовки задачи, размеры задач)
+CASES = {
+    'метод_исключения': (_gauss('метод_исключения'), [50, 200, 800]),
+    'метод_гаусса': (_gauss('метод_гаусса'), [50, 200, 800]),
+    'метод_гаусса_с_выбором': (_gauss('метод_гаусса_с_выбором'), [50, 200, 800]),
+    'batch_solve': (_batch_solve, [10 ** 3, 10 ** 5, 10 ** 6]),
+    'метод_простых_итераций': (_iterative('метод_простых_итераций'), [100, 400, 1600]),
+    'метод_зейделя': (_iterative('метод_зейделя'), [100, 400]),
+    'jacobi_rotation': (_jacobi_rotation('max'), [10, 30, 60]),
+    'jacobi_rotation_parallel': (_jacobi_rotation('parallel'), [10, 30, 60]),
+    'power_iteration': (_power_iteration, [100, 400]),
+    'lanczos': (_lanczos, [100, 400]),
+    'find_eigenvectors': (_find_eigenvectors, [50, 200]),
+    'newton_method': (_newton_function('newton_method', lambda n: (n + 0.3, 1e-6)), [3, 6]),
+    'secant_method': (_newton_function('secant_method', lambda n: (n + 0.3, 1e-6, 0.01)), [3, 6]),
+    'chord_method': (_newton_function('chord_method', lambda n: (n - 0.5, n + 0.5, 1e-6)), [3, 6]),
+    'polynomial_roots_companion': (_polynomial_roots('companion'), [10 ** 2, 10 ** 4, 10 ** 5]),
+    'polynomial_roots_aberth': (_polynomial_roots('aberth'), [10 ** 2, 10 ** 4, 10 ** 5]),
+    'dih': (_dih, [6, 12]),
+    'sqrt_a': (_sqrt_a, [1, 10 ** 3, 10 ** 6]),
+    'fixed_point_plain': (_fixed_point('plain'), [100, 400]),
+    'fixed_point_anderson': (_fixed_point('anderson'), [100, 400]),
+    'find_all_roots': (_find_all_roots, [10, 100, 1000]),
+    'lagrange_interpolation': (_lagrange, [10, 50, 200]),
+    'piecewise_linear': (_piecewise('linear'), [10 ** 3, 10 ** 6]),
+    'piecewise_quadratic': (_piecewise('quadratic'), [10 ** 3, 10 ** 6]),
+    'piecewise_cubic': (_piecewise('cubic'), [10 ** 3, 10 ** 6]),
+    'newton_interpolation': (_newton_interpolation, [10, 30, 60]),
+    'chebyshev_approximation': (_chebyshev_approximation, [10 ** 3, 10 ** 6]),
+    'integral_smoothing': (_integral_smoothing, [10 ** 3, 10 ** 5, 10 ** 6]),
+}
+
+
+def measure(run, repeat=3):
+    """Лучшее время из repeat запусков и пиковая память отдельного запуска под tracemalloc."""
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return result, best, peak
+
+
+def run_benchmarks(only=None, repeat=3, seed=0):
+    """
+    Выполняет замеры.
+
+    Возвращает словарь {"метод/размер": {"time", "peak_memory", "error", ["iterations"], ["evaluations"]}}.
+    Методы, модули которых не импортируются в текущем окружении, пропускаются.
+    """
+    results = {}
+    for name, (prepare, sizes) in CASES.items():
+        if only and only not in name:
+            continue
+        for n in sizes:
+            rng = np.random.default_rng(seed)
+            try:
+                run, check = prepare(n, rng)
+            except ImportError as error:
+                print(f"{name}: пропущен ({error})", file=sys.stderr)
+                break
+            result, elapsed, peak = measure(run, repeat)
+            record = {'time': elapsed, 'peak_memory': peak}
+            record.update({key: float(value) for key, value in check(result).items()})
+            results[f'{name}/{n}'] = record
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Список замеров, время которых выросло больше чем в threshold раз относительно baseline."""
+    regressions = []
+    for key, record in results.items():
+        if key in baseline and record['time'] > threshold * baseline[key]['time']:
+            regressions.append((key, baseline[key]['time'], record['time']))
+    return regressions
+
+
+def print_table(results):
+    print(f"{'метод/размер':40} {'время, с':>12} {'память, КБ':>12} {'итерации':>10} {'вычисления':>10} "
+          f"{'погрешность':>12}")
+    for key, record in results.items():
+        iterations, evaluations = record.get('iterations'), record.get('evaluations')
+        print(f"{key:40} {record['time']:12.6f} {record['peak_memory'] / 1024:12.1f} "
+              f"{'' if iterations is None else int(iterations):>10} "
+              f"{'' if evaluations is None else int(evaluations):>10} {record['error']:12.3e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', help='замерять только методы, в названии которых есть эта строка')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help='сохранить замеры в JSON')
+    parser.add_argument('--baseline', help='JSON с базовыми замерами для сравнения')
+    parser.add_argument('--threshold', type=float, default=1.5, help='допустимое замедление (во сколько раз)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.repeat)
+    print_table(results)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for key, before, after in regressions:
+            print(f"Замедление {key}: {before:.6f} с -> {after:.6f} с", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
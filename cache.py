@@ -0,0 +1,131 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from out_of_core import rows_per_block
+
+
+def array_digest(*inputs, **params):
+    """
+    Ключ кэша: хэш содержимого массивов (dtype, форма, байты) и параметров.
+    Большие массивы и np.memmap читаются блоками строк, целиком в память не загружаются.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for a in inputs:
+        a = np.asarray(a)
+        h.update(f"{a.dtype.str}{a.shape}".encode())
+        if a.ndim == 0:
+            h.update(a.tobytes())
+            continue
+        step = rows_per_block(a[0].size if len(a) else 1)
+        for start in range(0, len(a), step):
+            h.update(np.ascontiguousarray(a[start:start + step]).tobytes())
+    h.update(repr(sorted(params.items())).encode())
+    return h.hexdigest()
+
+
+class ArrayCache:
+    """
+    Кэш результатов (наборов массивов) по ключу из содержимого входных данных.
+
+    Два уровня:
+    - в процессе: последние memory_items результатов (LRU);
+    - на диске: каталог directory/<ключ>/<имя>.npy, файлы открываются через np.memmap,
+      поэтому повторный запуск получает результат за миллисекунды, не читая его целиком.
+      Общий размер ограничен max_bytes, вытесняются давно не использованные записи
+      (время последнего обращения - mtime каталога записи).
+
+    Возвращаемые массивы доступны только для чтения.
+    """
+
+    def __init__(self, directory, max_bytes=2 ** 30, memory_items=64):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self.hits = self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key):
+        """Словарь {имя: массив} или None, если записи нет."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        path = os.path.join(self.directory, key)
+        try:
+            names = [name for name in os.listdir(path) if name.endswith('.npy')]
+            arrays = {name[:-4]: np.load(os.path.join(path, name), mmap_mode='r') for name in names}
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, arrays)
+        return arrays
+
+    def put(self, key, arrays):
+        """
+        Сохраняет словарь {имя: массив}; запись на диск атомарна (через временный каталог).
+        Возвращает сохраненные массивы только для чтения.
+        """
+        arrays = {name: np.asarray(a) for name, a in arrays.items()}
+        path = os.path.join(self.directory, key)
+        if not os.path.isdir(path):
+            temporary = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+            for name, a in arrays.items():
+                np.save(os.path.join(temporary, name + '.npy'), a)
+            try:
+                os.rename(temporary, path)
+            except OSError:
+                # Ту же запись уже сохранил другой процесс
+                shutil.rmtree(temporary, ignore_errors=True)
+            self._evict(keep=key)
+        arrays = {name: _read_only(a) for name, a in arrays.items()}
+        self._remember(key, arrays)
+        return arrays
+
+    def cached(self, key, compute):
+        """Результат compute() (словарь массивов) из кэша или вычисленный и сохраненный."""
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = self.put(key, compute())
+        return arrays
+
+    def clear(self):
+        self._memory.clear()
+        for entry in os.scandir(self.directory):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _remember(self, key, arrays):
+        self._memory[key] = arrays
+        self._memory.move_to_end(key)
+        while self._memory and len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self, keep=None):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith('.tmp-') or not entry.is_dir():
+                continue
+            size = sum(f.stat().st_size for f in os.scandir(entry.path))
+            entries.append((entry.stat().st_mtime, size, entry.name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+            self._memory.pop(name, None)
+            total -= size
+
+
+def _read_only(a):
+    a = a.view()
+    a.flags.writeable = False
+    return a
@@ -1,39 +1,237 @@
+import functools
+import time
+
 import numpy as np
-def dih(f, l, r, eps=1e-7):
-    if f(l) * f(r) > 0:
-        return None
-    while abs(r - l) > eps:
-        m = (l + r) / 2
-        if f(m) == 0:
-            return m
-        elif f(m) * f(l) < 0:
-            r = m
+
+from parallel import parallel_map, resolve_workers
+from solver_result import STATUS_CONVERGED, STATUS_NO_SIGN_CHANGE, SolverResult, make_observer
+
+
+class CountedFunction:
+    """
+    Обертка над f, считающая количество вычислений.
+    При cache_size > 0 последние cache_size значений запоминаются (LRU по x),
+    так что повторные обращения к той же точке не вызывают f.
+    """
+
+    def __init__(self, f, cache_size=0):
+        self.f = f
+        self.n_evaluations = 0
+        if cache_size:
+            self._call = functools.lru_cache(maxsize=cache_size)(self._evaluate)
         else:
-            l = m
-    return (l + r) / 2
+            self._call = self._evaluate
+
+    def _evaluate(self, x):
+        self.n_evaluations += 1
+        return self.f(x)
+
+    def __call__(self, x):
+        return self._call(x)
+
+
+def dih(f, l, r, eps=1e-7, cache_size=0, full_output=False, callback=None, return_result=False):
+    """
+    Метод деления отрезка пополам. Значения f(l), f(r) и f(m) переносятся
+    между шагами, поэтому на каждом шаге f вычисляется ровно один раз.
+
+    При full_output=True возвращает (корень, количество вычислений f).
+    callback(итерация, середина отрезка, длина отрезка) вызывается на каждой итерации.
+    При return_result=True возвращает SolverResult с историей длин отрезка;
+    если f не меняет знак на [l, r], статус STATUS_NO_SIGN_CHANGE.
+    """
+    start = time.perf_counter()
+    f = CountedFunction(f, cache_size)
+    history = [] if return_result else None
+    observe = make_observer(callback, history)
+    iteration = 0
+    fl, fr = f(l), f(r)
+    root = None
+    if fl * fr <= 0:
+        while abs(r - l) > eps:
+            m = (l + r) / 2
+            fm = f(m)
+            iteration += 1
+            if fm == 0:
+                root = m
+                break
+            elif fm * fl < 0:
+                r, fr = m, fm
+            else:
+                l, fl = m, fm
+            if observe:
+                observe(iteration, m, abs(r - l))
+        else:
+            root = (l + r) / 2
+    if return_result:
+        status = STATUS_CONVERGED if root is not None else STATUS_NO_SIGN_CHANGE
+        message = '' if root is not None else f"f не меняет знак на [{l}, {r}]"
+        return SolverResult(root, iteration, f.n_evaluations, history, start, status, message)
+    if full_output:
+        return root, f.n_evaluations
+    return root
+
+
+def _vectorized(f):
+    """Возвращает версию f, принимающую массив точек."""
+    probe = np.linspace(0.0, 1.0, 3)
+    try:
+        if np.shape(f(probe)) == probe.shape:
+            return f
+    except (TypeError, ValueError):
+        pass
+    return np.vectorize(f, otypes=[float])
+
+
+def _multiplicity(f, roots, h):
+    """
+    Оценивает кратность корней по скорости роста |f| рядом с корнем:
+    f(x) ~ c (x - root)^k, поэтому k ~ log2(|f(root +- 2h)| / |f(root +- h)|).
+    """
+    g1 = np.abs(f(roots + h)) + np.abs(f(roots - h))
+    g2 = np.abs(f(roots + 2 * h)) + np.abs(f(roots - 2 * h))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = np.log2(g2 / g1)
+    k = np.where(np.isfinite(k), np.rint(k), 1)
+    return np.maximum(k, 1).astype(int)
 
 
-def find_all_roots(f, range_l, range_r, eps=1e-5, max_roots=100, max_attempts=1000):
-    roots = []
-    attempts = 0
-    while len(roots) < max_roots and attempts < max_attempts:
-        l = np.random.uniform(range_l, range_r)
-        r = np.random.uniform(range_l, range_r)
-        l, r = min(l, r), max(l, r)
+def _locate_task(task):
+    """Поиск корней на одном участке общей сетки (задача для parallel_map)."""
+    return _locate_on_grid(*task)
+
+
+def _merge_roots(roots, multiplicities, eps, max_roots):
+    """Сортирует корни и убирает совпадающие (ближе 2 eps)."""
+    order = np.argsort(roots, kind='stable')
+    roots, multiplicities = roots[order], multiplicities[order]
+    if roots.size:
+        unique = np.concatenate(([True], np.diff(roots) > 2 * eps))
+        roots, multiplicities = roots[unique], multiplicities[unique]
+    return roots[:max_roots], multiplicities[:max_roots]
+
+
+def locate_roots(f, range_l, range_r, eps=1e-5, n_points=None, max_roots=100, workers=1, ftol=None):
+    """
+    Детерминированный поиск всех корней f на отрезке [range_l, range_r].
+
+    Функция вычисляется на равномерной сетке, затем
+    - отрезки со сменой знака уточняются одновременной бисекцией,
+    - локальные минимумы |f| без смены знака (корни четной кратности)
+      уточняются одновременным методом золотого сечения.
+
+    Параметры:
+    - f: функция, желательно принимающая массивы numpy
+    - eps: точность по x
+    - n_points: количество узлов сетки (по умолчанию 20 * max_roots + 1)
+    - max_roots: максимальное количество возвращаемых корней
+    - workers: количество процессов; сетка делится на участки (срезы одной и той же
+      сетки), соседние участки перекрываются на один шаг, поэтому результат не зависит
+      от workers (f должна сериализоваться pickle)
+    - ftol: допуск на |f| в минимуме без смены знака, при котором минимум считается
+      корнем четной кратности. По умолчанию (None) допуск относительный: |f| в минимуме
+      должно быть в step / eps раз меньше, чем на концах отрезка (step - шаг сетки),
+      так что f(x) = x^2 + 1e-6 корней не имеет, а у c (x - a)^2 корень находится
+
+    Возвращает:
+    - roots: отсортированный массив корней
+    - multiplicities: оценки кратности корней
+    - n_evaluations: количество вычисленных значений f
+    """
+    if n_points is None:
+        n_points = 20 * max_roots + 1
+    workers = min(resolve_workers(workers), max(1, (n_points - 1) // 4))
+    xs = np.linspace(range_l, range_r, n_points)
+    step = xs[1] - xs[0]
+    if workers == 1:
+        return _locate_on_grid(f, xs, step, eps, max_roots, ftol)
+
+    bounds = np.linspace(0, n_points - 1, workers + 1).astype(int)
+    tasks = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        lo, hi = max(lo - 1, 0), min(hi + 1, n_points - 1)
+        tasks.append((f, xs[lo:hi + 1], step, eps, max_roots, ftol))
+    results = parallel_map(_locate_task, tasks, workers, backend='process')
+    roots, multiplicities = _merge_roots(np.concatenate([r[0] for r in results]),
+                                         np.concatenate([r[1] for r in results]), eps, max_roots)
+    return roots, multiplicities, sum(r[2] for r in results)
+
+
+def _locate_on_grid(f, xs, step, eps, max_roots, ftol=None):
+    """
+    Поиск корней по узлам xs (шаг сетки step); возвращает то же, что locate_roots.
+    Участки при workers > 1 получают срезы одной сетки и тот же step, поэтому
+    корни совпадают с последовательным поиском.
+    """
+    f = _vectorized(f)
+    ys = f(xs)
+    n_evaluations = len(xs)
+
+    # Корни, попавшие точно в узлы сетки
+    found = [xs[ys == 0]]
+
+    # Смена знака: бисекция всех отрезков сразу
+    idx = np.flatnonzero(ys[:-1] * ys[1:] < 0)
+    l, r, fl = xs[idx], xs[idx + 1], ys[idx]
+    if idx.size:
+        for _ in range(max(0, int(np.ceil(np.log2(step / eps))))):
+            m = (l + r) / 2
+            fm = f(m)
+            n_evaluations += m.size
+            left = fm * fl < 0
+            r = np.where(left, m, r)
+            l = np.where(left, l, m)
+            fl = np.where(left, fl, fm)
+        found.append((l + r) / 2)
+
+    # Минимумы |f| без смены знака: золотое сечение всех отрезков сразу
+    a = np.abs(ys)
+    idx = 1 + np.flatnonzero((a[1:-1] < a[:-2]) & (a[1:-1] < a[2:]) & (ys[:-2] * ys[2:] > 0) & (ys[1:-1] != 0))
+    if idx.size:
+        invphi = (np.sqrt(5) - 1) / 2
+        lo, hi = xs[idx - 1], xs[idx + 1]
+        c, d = hi - invphi * (hi - lo), lo + invphi * (hi - lo)
+        fc, fd = np.abs(f(c)), np.abs(f(d))
+        n_evaluations += 2 * idx.size
+        for _ in range(max(0, int(np.ceil(np.log(eps / (2 * step)) / np.log(invphi))))):
+            left = fc < fd
+            hi = np.where(left, d, hi)
+            lo = np.where(left, lo, c)
+            d_new = np.where(left, c, lo + invphi * (hi - lo))
+            c_new = np.where(left, hi - invphi * (hi - lo), d)
+            fx = np.abs(f(np.where(left, c_new, d_new)))
+            n_evaluations += idx.size
+            fc, fd = np.where(left, fx, fd), np.where(left, fc, fx)
+            c, d = c_new, d_new
+        x_min = (lo + hi) / 2
+        f_min = np.abs(f(x_min))
+        n_evaluations += idx.size
+        if ftol is None:
+            # Для корня кратности 2k |f| в минимуме ~ (eps / step)^(2k) от |f| на концах,
+            # для минимума без корня отношение от eps не зависит
+            f_ends = np.minimum(a[idx - 1], a[idx + 1])
+            found.append(x_min[f_min <= f_ends * (eps / step)])
+        else:
+            found.append(x_min[f_min <= ftol])
 
-        root = dih(f, l, r, eps)
-        while root is not None and abs(f(root+eps/10)) < eps:
-            roots.append(root)
-            f = lambda x, f=f, root=root: f(x) / (x - root) if x != root else 0
+    roots, _ = _merge_roots(np.concatenate(found), np.zeros(sum(len(r) for r in found), dtype=int), eps, max_roots)
+    multiplicities = _multiplicity(f, roots, step / 4)
+    n_evaluations += 4 * roots.size
+    return roots, multiplicities, n_evaluations
 
-        attempts += 1
 
-    return list(roots)
+def find_all_roots(f, range_l, range_r, eps=1e-5, max_roots=100, n_points=None, workers=1, ftol=None):
+    """
+    Находит все корни f на отрезке, кратные корни повторяются по числу кратности.
+    """
+    roots, multiplicities, _ = locate_roots(f, range_l, range_r, eps, n_points, max_roots, workers, ftol)
+    return np.repeat(roots, multiplicities).tolist()
 
 
 def f(x):
     return (x - 2) * ((x - 3) ** 3) * (x - 7)
     #return (x - 2) * ((x - 3) ** 2) * (x - 7)
 
-roots = find_all_roots(f, -10, 10)
-print([round(x,2) for x in roots])
+if __name__ == "__main__":
+    roots = find_all_roots(f, -10, 10)
+    print([round(x,2) for x in roots])
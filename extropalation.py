@@ -1,22 +1,77 @@
-# Данные точки
-x = [3, 4, 5, 6]
-f_x = [1, 0, 4, 2]
-x_star = 4.5
+import numpy as np
 
 # 1. Глобальный метод с использованием полиномов Лагранжа
+class BarycentricInterpolator:
+    """
+    Интерполяционный полином Лагранжа в барицентрической форме.
+    Веса w_j = 1 / prod(x_j - x_k) вычисляются один раз за O(n^2),
+    после чего значение в каждой точке считается за O(n):
+    P(x) = sum(w_j f_j / (x - x_j)) / sum(w_j / (x - x_j)).
+    """
+
+    def __init__(self, x, f_x):
+        self.x = np.array(x, dtype=float)
+        self.f_x = np.array(f_x, dtype=float)
+        if len(np.unique(self.x)) != len(self.x):
+            raise ValueError("Узлы интерполяции должны быть различными")
+        # Разности умножаются на 4 / (длина отрезка), чтобы произведения не переполнялись
+        span = np.ptp(self.x) if len(self.x) > 1 else 1.0
+        self.scale = 4 / span if span else 1.0
+        differences = self.scale * (self.x[:, None] - self.x[None, :])
+        np.fill_diagonal(differences, 1)
+        self.weights = 1 / np.prod(differences, axis=1)
+        self.divisor = 1.0
+        self._rescale()
+
+    def _rescale(self):
+        # Общий множитель весов сокращается в формуле, масштабируем от переполнения;
+        # хранятся веса, деленные на divisor
+        if len(self.weights):
+            largest = np.max(np.abs(self.weights))
+            self.weights /= largest
+            self.divisor *= largest
+
+    def add_node(self, x_new, f_new):
+        """Добавляет узел, пересчитывая веса за O(n)."""
+        if np.any(self.x == x_new):
+            raise ValueError(f"Узел {x_new} уже есть")
+        w_new = 1 / np.prod(self.scale * (x_new - self.x)) / self.divisor
+        self.weights = np.append(self.weights / (self.scale * (self.x - x_new)), w_new)
+        self.x = np.append(self.x, float(x_new))
+        self.f_x = np.append(self.f_x, float(f_new))
+        self._rescale()
+
+    def __call__(self, x_star, chunk_size=None):
+        """
+        Вычисляет значения полинома в точке или массиве точек x_star.
+        Точки обрабатываются блоками по chunk_size, чтобы ограничить память.
+        """
+        points = np.asarray(x_star, dtype=float)
+        flat = points.ravel()
+        result = np.empty(flat.size)
+        if chunk_size is None:
+            chunk_size = max(1, 2 ** 20 // max(len(self.x), 1))
+        for start in range(0, flat.size, chunk_size):
+            differences = flat[start:start + chunk_size, None] - self.x[None, :]
+            exact = differences == 0
+            differences[exact] = 1
+            terms = self.weights / differences
+            values = (terms @ self.f_x) / terms.sum(axis=1)
+            # Точка совпала с узлом - значение в узле
+            rows, nodes = np.nonzero(exact)
+            values[rows] = self.f_x[nodes]
+            result[start:start + chunk_size] = values
+        if points.ndim == 0:
+            return float(result[0])
+        return result.reshape(points.shape)
+
+
 def lagrange_interpolation(x, f_x, x_star):
     """
-    Вычисляет интерполированное значение с использованием полиномов Лагранжа для заданного x_star.
+    Вычисляет интерполированное значение с использованием полиномов Лагранжа для заданного x_star
+    (число или массив точек).
     """
-    n = len(x)
-    P_x_star = 0
-    for i in range(n):
-        L_i = 1
-        for j in range(n):
-            if i != j:
-                L_i *= (x_star - x[j]) / (x[i] - x[j])
-        P_x_star += f_x[i] * L_i
-    return P_x_star
+    return BarycentricInterpolator(x, f_x)(x_star)
 
 # 2. Линейная интерполяция
 def linear_interpolation(x1, x2, f_x1, f_x2, x_star):
@@ -39,14 +94,156 @@ def parabolic_interpolation(x_values, f_x_values, x_star):
 
     return b0 + b1 * (x_star - x0) + b2 * (x_star - x0) * (x_star - x1)
 
-# Оцените интерполяцию на x_star с использованием трех методов
-global_result = lagrange_interpolation(x, f_x, x_star)
-linear_result = linear_interpolation(x[1], x[2], f_x[1], f_x[2], x_star)
-parabola_1_result = parabolic_interpolation(x[:3], f_x[:3], x_star)
-parabola_2_result = parabolic_interpolation(x[1:], f_x[1:], x_star)
-parabolic_result = (parabola_1_result + parabola_2_result) / 2
-
-# Вывод результатов
-print(f"Глобальный метод (полиномы Лагранжа): f(x*) = {global_result}")
-print(f"Линейная интерполяция: f(x*) = {linear_result}")
-print(f"Параболическая интерполяция (усредненная): f(x*) = {parabolic_result}")
+# 4. Кусочная интерполяция по всему массиву узлов
+class PiecewiseInterpolator:
+    """
+    Кусочная интерполяция по всем узлам сразу.
+    Узлы сортируются один раз, на каждом отрезке [x_i, x_{i+1}] хранятся коэффициенты
+    многочлена от t = x - x_i; отрезки для массива точек находятся двоичным поиском
+    (np.searchsorted), значения считаются схемой Горнера для всех точек одновременно.
+
+    kind:
+    - 'linear': линейная интерполяция между соседними узлами
+    - 'quadratic': среднее двух парабол по узлам (x_{i-1}, x_i, x_{i+1}) и (x_i, x_{i+1}, x_{i+2}),
+      как в parabolic_interpolation; на крайних отрезках - одна парабола
+    - 'cubic': естественный кубический сплайн (S'' = 0 на концах)
+
+    Вне [x_0, x_{n-1}] продолжается многочлен крайнего отрезка.
+    """
+
+    KINDS = ('linear', 'quadratic', 'cubic')
+
+    def __init__(self, x, f_x, kind='linear'):
+        if kind not in self.KINDS:
+            raise ValueError(f"Неизвестный вид интерполяции: {kind}, допустимые: {self.KINDS}")
+        x = np.asarray(x, dtype=float)
+        f_x = np.asarray(f_x, dtype=float)
+        if len(x) < 2:
+            raise ValueError("Нужно хотя бы два узла")
+        order = np.argsort(x, kind='stable')
+        self.x = x[order]
+        self.f_x = f_x[order]
+        h = np.diff(self.x)
+        if np.any(h == 0):
+            raise ValueError("Узлы интерполяции должны быть различными")
+        self.kind = kind
+        slopes = np.diff(self.f_x) / h
+
+        # Коэффициенты c0 + c1 t + c2 t^2 + c3 t^3 по отрезкам, по столбцу на степень
+        self.coefs = np.zeros((len(h), 4))
+        self.coefs[:, 0] = self.f_x[:-1]
+        self.coefs[:, 1] = slopes
+        if kind == 'quadratic' and len(h) > 1:
+            # Вторая разделенная разность f[x_{i-1}, x_i, x_{i+1}] для внутренних узлов;
+            # парабола через x_{i-1}, x_i, x_{i+1} на отрезке i: f_i + s_i t + d (t^2 - h_i t)
+            second = np.diff(slopes) / (self.x[2:] - self.x[:-2])
+            left = np.concatenate([second[:1], second])    # парабола с узлом x_{i-1}
+            right = np.concatenate([second, second[-1:]])  # парабола с узлом x_{i+2}
+            d = (left + right) / 2
+            self.coefs[:, 1] -= d * h
+            self.coefs[:, 2] = d
+        elif kind == 'cubic' and len(h) > 1:
+            M = self._spline_second_derivatives(h, slopes)
+            self.coefs[:, 1] -= h * (2 * M[:-1] + M[1:]) / 6
+            self.coefs[:, 2] = M[:-1] / 2
+            self.coefs[:, 3] = np.diff(M) / (6 * h)
+
+    @staticmethod
+    def _spline_second_derivatives(h, slopes):
+        """
+        Вторые производные естественного сплайна в узлах: трехдиагональная система
+        h_{i-1} M_{i-1} + 2 (h_{i-1} + h_i) M_i + h_i M_{i+1} = 6 (s_i - s_{i-1}), M_0 = M_{n-1} = 0,
+        решается методом прогонки за O(n).
+        """
+        n = len(h) + 1
+        M = np.zeros(n)
+        if n < 3:
+            return M
+        lower = h[:-1].tolist()
+        diagonal = (2 * (h[:-1] + h[1:])).tolist()
+        upper = h[1:].tolist()
+        rhs = (6 * np.diff(slopes)).tolist()
+        # Прямой ход
+        for i in range(1, len(diagonal)):
+            m = lower[i] / diagonal[i - 1]
+            diagonal[i] -= m * upper[i - 1]
+            rhs[i] -= m * rhs[i - 1]
+        # Обратный ход
+        solution = [0.0] * len(diagonal)
+        solution[-1] = rhs[-1] / diagonal[-1]
+        for i in range(len(diagonal) - 2, -1, -1):
+            solution[i] = (rhs[i] - upper[i] * solution[i + 1]) / diagonal[i]
+        M[1:-1] = solution
+        return M
+
+    def locate(self, x_star):
+        """Номера отрезков [x_i, x_{i+1}], содержащих точки x_star (крайние - для точек вне узлов)."""
+        index = np.searchsorted(self.x, x_star, side='right') - 1
+        # Для одной точки searchsorted возвращает скаляр, out= к нему неприменим
+        return np.clip(index, 0, len(self.x) - 2, out=index if isinstance(index, np.ndarray) else None)
+
+    def __call__(self, x_star, chunk_size=2 ** 20):
+        """
+        Вычисляет значения в точке или массиве точек x_star.
+        Точки обрабатываются блоками по chunk_size, чтобы ограничить память.
+        Неупорядоченный блок сортируется перед поиском: двоичный поиск по соседним точкам
+        и выборка коэффициентов идут подряд по памяти, что в разы быстрее на больших таблицах.
+        """
+        points = np.asarray(x_star, dtype=float)
+        flat = points.ravel()
+        result = np.empty(flat.size)
+        degree = {'linear': 1, 'quadratic': 2, 'cubic': 3}[self.kind]
+        for start in range(0, flat.size, chunk_size):
+            chunk = flat[start:start + chunk_size]
+            order = None
+            if chunk.size > 1 and not np.all(chunk[1:] >= chunk[:-1]):
+                order = np.argsort(chunk)
+                chunk = chunk[order]
+            index = self.locate(chunk)
+            t = chunk - self.x[index]
+            values = self.coefs[index, degree]
+            for k in range(degree - 1, -1, -1):
+                values *= t
+                values += self.coefs[index, k]
+            if order is None:
+                result[start:start + chunk_size] = values
+            else:
+                result[start:start + chunk_size][order] = values
+        if points.ndim == 0:
+            return float(result[0])
+        return result.reshape(points.shape)
+
+
+def piecewise_interpolation(x, f_x, x_star, kind='linear'):
+    """
+    Кусочная интерполяция по всем узлам x для числа или массива точек x_star,
+    см. PiecewiseInterpolator.
+    """
+    return PiecewiseInterpolator(x, f_x, kind)(x_star)
+
+if __name__ == "__main__":
+    # Данные точки
+    x = [3, 4, 5, 6]
+    f_x = [1, 0, 4, 2]
+    x_star = 4.5
+
+    # Оцените интерполяцию на x_star с использованием трех методов
+    global_result = lagrange_interpolation(x, f_x, x_star)
+    linear_result = linear_interpolation(x[1], x[2], f_x[1], f_x[2], x_star)
+    parabola_1_result = parabolic_interpolation(x[:3], f_x[:3], x_star)
+    parabola_2_result = parabolic_interpolation(x[1:], f_x[1:], x_star)
+    parabolic_result = (parabola_1_result + parabola_2_result) / 2
+
+    # Вывод результатов
+    print(f"Глобальный метод (полиномы Лагранжа): f(x*) = {global_result}")
+    print(f"Линейная интерполяция: f(x*) = {linear_result}")
+    print(f"Параболическая интерполяция (усредненная): f(x*) = {parabolic_result}")
+
+    # Барицентрическая форма: веса считаются один раз, значения - сразу для массива точек
+    interpolator = BarycentricInterpolator(x, f_x)
+    print(f"Полином Лагранжа на сетке: {interpolator(np.linspace(3, 6, 7))}")
+
+    # Кусочная интерполяция: отрезки для всех точек находятся сразу по всему массиву узлов
+    print(f"Линейная (все узлы): f(x*) = {piecewise_interpolation(x, f_x, x_star)}")
+    print(f"Параболическая (все узлы): f(x*) = {piecewise_interpolation(x, f_x, x_star, 'quadratic')}")
+    print(f"Кубический сплайн на сетке: {piecewise_interpolation(x, f_x, np.linspace(3, 6, 7), 'cubic')}")
@@ -1,162 +1,533 @@
+import time
+
 import numpy as np
 from pprint import pprint
 
-
-def метод_исключения(A, b):
-    A = np.array(A, float)
-    b = np.array(b, float)
-    n = len(b)
-
-    # Прямой ход
-    for i in range(n):
-        # Приведение к верхнетреугольному виду
-        for j in range(i + 1, n):
-            factor = A[j][i] / A[i][i]
-            A[j] -= factor * A[i]
-            b[j] -= factor * b[i]
+from cache import array_digest
+from out_of_core import load_array, rows_per_block, working_copy
+from solver_result import STATUS_CONVERGED, STATUS_MAX_ITERATIONS, SolverResult, make_observer
+
+
+class LUFactorization:
+    """
+    LU-разложение PA = LU, хранящееся в одной матрице (L с единичной диагональю ниже
+    диагонали, U на и выше диагонали), и перестановка строк perm.
+    Разложение выполняется один раз, solve можно вызывать для любого числа правых частей.
+    """
+
+    def __init__(self, LU, perm, block_size=64):
+        self.LU = LU
+        self.perm = perm
+        self.block_size = block_size
+
+    def solve(self, b):
+        """Решает Ax = b; b может быть вектором (n,) или матрицей правых частей (n, k)."""
+        LU, nb = self.LU, self.block_size
+        n = len(LU)
+        x = np.array(b, float)[self.perm]
+        vector = x.ndim == 1
+        if vector:
+            x = x[:, None]
+
+        # Прямой ход: Ly = Pb, блоками строк
+        for k0 in range(0, n, nb):
+            k1 = min(k0 + nb, n)
+            x[k0:k1] -= LU[k0:k1, :k0] @ x[:k0]
+            for i in range(k0 + 1, k1):
+                x[i] -= LU[i, k0:i] @ x[k0:i]
+
+        # Обратный ход: Ux = y, блоками строк снизу вверх
+        for k1 in range(n, 0, -nb):
+            k0 = max(k1 - nb, 0)
+            x[k0:k1] -= LU[k0:k1, k1:] @ x[k1:]
+            for i in range(k1 - 1, k0 - 1, -1):
+                x[i] -= LU[i, i + 1:k1] @ x[i + 1:k1]
+                x[i] /= LU[i, i]
+
+        return x[:, 0] if vector else x
+
+
+def lu_factor(A, pivoting=True, block_size=64, overwrite_a=False, out=None, cache=None):
+    """
+    Блочное LU-разложение с частичным выбором главного элемента по столбцу.
+
+    Столбцы обрабатываются панелями ширины block_size: панель раскладывается
+    в памяти по столбцам, затем остаток матрицы обновляется матричными умножениями
+    по блокам строк. В памяти одновременно находятся только панель и блок строк,
+    поэтому A может быть np.memmap или файлом .npy больше оперативной памяти.
+
+    Параметры:
+    - A: матрица n x n, np.memmap или путь к файлу .npy
+    - pivoting: выбирать ли главный элемент (False - обычный метод Гаусса)
+    - block_size: ширина панели
+    - overwrite_a: раскладывать A на месте, без копии (A будет испорчена)
+    - out: путь к файлу .npy для разложения, если копия не помещается в память
+    - cache: ArrayCache; разложение той же матрицы берется из кэша (LU только для чтения)
+
+    Возвращает:
+    - LUFactorization
+    """
+    if cache is not None:
+        key = array_digest(load_array(A), function='lu_factor', pivoting=pivoting, block_size=block_size)
+
+        def compute():
+            factorization = lu_factor(A, pivoting, block_size, overwrite_a, out)
+            return {'LU': factorization.LU, 'perm': factorization.perm}
+        arrays = cache.cached(key, compute)
+        return LUFactorization(arrays['LU'], arrays['perm'], block_size)
+
+    LU = working_copy(A, overwrite_a, out)
+    n = len(LU)
+    perm = np.arange(n)
+    step = rows_per_block(n)
+
+    for k0 in range(0, n, block_size):
+        k1 = min(k0 + block_size, n)
+        # Разложение панели в памяти
+        panel = np.array(LU[k0:, k0:k1])
+        swaps = []
+        for k in range(k1 - k0):
+            if pivoting:
+                p = k + np.argmax(np.abs(panel[k:, k]))
+                if p != k:
+                    panel[[k, p]] = panel[[p, k]]
+                    perm[[k0 + k, k0 + p]] = perm[[k0 + p, k0 + k]]
+                    swaps.append((k0 + k, k0 + p))
+            if panel[k, k] == 0:
+                raise np.linalg.LinAlgError(f"Нулевой главный элемент в столбце {k0 + k}, матрица вырождена")
+            panel[k + 1:, k] /= panel[k, k]
+            panel[k + 1:, k + 1:] -= np.outer(panel[k + 1:, k], panel[k, k + 1:])
+        LU[k0:, k0:k1] = panel
+
+        # Перестановки строк вне панели
+        for i, p in swaps:
+            LU[[i, p], :k0] = LU[[p, i], :k0]
+            LU[[i, p], k1:] = LU[[p, i], k1:]
+
+        # Строки U справа от панели
+        U12 = np.array(LU[k0:k1, k1:])
+        for k in range(k1 - k0):
+            U12[k + 1:] -= np.outer(panel[k + 1:k1 - k0, k], U12[k])
+        LU[k0:k1, k1:] = U12
+
+        # Обновление оставшейся части матрицы блоками строк
+        for r0 in range(k1, n, step):
+            r1 = min(r0 + step, n)
+            LU[r0:r1, k1:] -= panel[r0 - k0:r1 - k0] @ U12
+
+    return LUFactorization(LU, perm, block_size)
+
+
+def метод_исключения(A, b, cache=None):
+    return lu_factor(A, pivoting=False, cache=cache).solve(b)
+
+
+def метод_гаусса_с_выбором(A, b, overwrite_a=False, cache=None):
+    return lu_factor(A, overwrite_a=overwrite_a, cache=cache).solve(b)
+
+
+def метод_гаусса(A, b, cache=None):
+    # Без выбора главного элемента
+    return lu_factor(A, pivoting=False, cache=cache).solve(b)
+
+
+def batch_solve(A, b, chunk_size=None):
+    """
+    Решает сразу много независимых систем малого размера. Блоки из chunk_size систем
+    решаются np.linalg.solve (LAPACK); системы блока, на которых LAPACK встречает
+    нулевой главный элемент, и почти вырожденные (||x|| * ||A||_F > ||b|| / sqrt(eps))
+    решаются заново методом Гаусса с выбором главного элемента по столбцу, который
+    выполняется одновременно для всех таких систем и отмечает вырожденные.
+
+    Параметры:
+    - A: массив (batch, n, n)
+    - b: массив (batch, n) или (batch, n, k)
+    - chunk_size: количество систем, решаемых одновременно
+      (по умолчанию - около 2^17 элементов матриц в блоке)
+
+    Возвращает:
+    - x: решения той же формы, что b; для вырожденных систем - nan
+    - singular: булев массив (batch,), True для вырожденных (с точностью до
+      n * машинный эпсилон * max|A|) систем; исключение не выбрасывается
+    """
+    A = np.asarray(A)
+    b = np.asarray(b)
+    if A.ndim != 3 or A.shape[1] != A.shape[2] or b.shape[:2] != A.shape[:2]:
+        raise ValueError(f"Ожидаются A формы (batch, n, n) и b формы (batch, n[, k]), получены {A.shape} и {b.shape}")
+    vector = b.ndim == 2
+    if vector:
+        b = b[..., None]
+    if chunk_size is None:
+        chunk_size = max(1, 2 ** 17 // max(A.shape[1], 1) ** 2)
+    x = np.empty(b.shape)
+    singular = np.empty(len(A), dtype=bool)
+    for start in range(0, len(A), chunk_size):
+        stop = start + chunk_size
+        x[start:stop], singular[start:stop] = _batch_solve_lapack(A[start:stop], b[start:stop])
+    return (x[..., 0] if vector else x), singular
+
+
+def _batch_solve_lapack(A, b):
+    singular = np.zeros(len(A), dtype=bool)
+    try:
+        X = np.linalg.solve(A, b)
+    except np.linalg.LinAlgError:
+        # Неизвестно, какая система блока вырождена: весь блок решается исключением
+        return _batch_solve_chunk(A, b)
+    # Для главного элемента порядка n * eps * max|A| решение растет примерно в 1 / (n * eps) раз,
+    # порог sqrt(eps) оставляет запас и почти не затрагивает обусловленные системы.
+    # Квадраты норм через einsum: редукции np.abs(...).max по двум осям заметно медленнее solve
+    growth = np.einsum('ijk,ijk->i', X, X) * np.einsum('ijk,ijk->i', A, A)
+    suspect = ~(growth * np.finfo(float).eps <= np.einsum('ijk,ijk->i', b, b))
+    if np.any(suspect):
+        X[suspect], singular[suspect] = _batch_solve_chunk(A[suspect], b[suspect])
+    return X, singular
+
+
+def _batch_solve_chunk(A, b):
+    # Исключение одновременно для всех систем: цикл только по столбцам, номер системы -
+    # последняя ось, так векторные операции идут подряд по памяти
+    n, batch = A.shape[1], A.shape[0]
+    M = np.moveaxis(A, 0, -1).astype(float, order='C')  # (n, n, batch)
+    B = np.moveaxis(b, 0, -1).astype(float, order='C')  # (n, k, batch)
+    tol = n * np.finfo(float).eps * np.abs(M).max(axis=(0, 1))
+    singular = np.zeros(batch, dtype=bool)
+
+    for k in range(n):
+        # Главный элемент столбца k и перестановка строк k и p в каждой системе
+        p = k + np.argmax(np.abs(M[k:, k]), axis=0)
+        if np.any(p != k):
+            # Столбцы левее k в строках k..n-1 уже нулевые, переставляются только столбцы k..n-1
+            for T in (M[:, k:], B):
+                row_k = T[k].copy()
+                T[k] = np.take_along_axis(T, p[None, None, :], axis=0)[0]
+                np.put_along_axis(T, p[None, None, :], row_k[None], axis=0)
+        pivot = M[k, k]
+        small = np.abs(pivot) <= tol
+        singular |= small
+        pivot = np.where(small, 1.0, pivot)
+
+        factors = M[k + 1:, k] / pivot
+        M[k + 1:, k:] -= factors[:, None] * M[k, k:]
+        B[k + 1:] -= factors[:, None] * B[k]
 
     # Обратный ход
-    x = np.zeros(n)
-    for i in range(n - 1, -1, -1):
-        x[i] = (b[i] - sum(A[i][j] * x[j] for j in range(i + 1, n))) / A[i][i]
-
-    return x
+    X = np.empty_like(B)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(n - 1, -1, -1):
+            X[i] = (B[i] - np.einsum('jb,jkb->kb', M[i, i + 1:], X[i + 1:])) / M[i, i]
+    X = np.moveaxis(X, -1, 0)
+    X[singular] = np.nan
+    return X, singular
 
 
-def метод_гаусса_с_выбором(A, b):
-    A = np.array(A, float)
-    b = np.array(b, float)
-    n = len(b)
-
-    # Прямой ход
-    for i in range(n):
-        # Частичный выбор главного элемента по столбцу
-        max_row = max(range(i, n), key=lambda r: abs(A[r][i]))
-        A[[i, max_row]], A[[max_row, i]] = A[[max_row, i]].copy(), A[[i, max_row]].copy()
-        b[i], b[max_row] = b[max_row], b[i]
-
-        # Приведение к верхнетреугольному виду
-        for j in range(i + 1, n):
-            factor = A[j][i] / A[i][i]
-            A[j] -= factor * A[i]
-            b[j] -= factor * b[i]
-
-    # Обратный ход
-    x = np.zeros(n)
-    for i in range(n - 1, -1, -1):
-        x[i] = (b[i] - sum(A[i][j] * x[j] for j in range(i + 1, n))) / A[i][i]
-
-    return x
-
-
-def метод_гаусса(A, b):
-    A = np.array(A, float)
-    b = np.array(b, float)
-    n = len(b)
-
-    # Прямой ход
-    for i in range(n):
-        # Приведение к верхнетреугольному виду без выбора главного элемента
-        for j in range(i + 1, n):
-            factor = A[j][i] / A[i][i]
-            A[j] -= factor * A[i]
-            b[j] -= factor * b[i]
-
-    # Обратный ход
-    x = np.zeros(n)
-    for i in range(n - 1, -1, -1):
-        x[i] = (b[i] - sum(A[i][j] * x[j] for j in range(i + 1, n))) / A[i][i]
-
-    return x
+def _as_matrix(A):
+    """Плотные входные данные приводятся к np.ndarray, разреженные (scipy.sparse) к CSR."""
+    if hasattr(A, 'tocsr'):
+        return A.tocsr().astype(float)
+    return np.asarray(A, float)
 
 
 def is_diagonally_dominant(A):
     """Check if matrix A is diagonally dominant."""
-    n = len(A)
-    for i in range(n):
-        if abs(A[i][i]) <= sum(abs(A[i][j]) for j in range(n) if j != i):
-            return False
-    return True
+    A = _as_matrix(A)
+    diag = np.abs(A.diagonal())
+    row_sums = np.asarray(abs(A).sum(axis=1)).ravel()
+    return bool(np.all(diag > row_sums - diag))
 
 
-def метод_простых_итераций(A, b, max_iterations=1000, tol=1e-10):
+def метод_простых_итераций(A, b, max_iterations=1000, tol=1e-10, x0=None, return_history=False):
+    """
+    Метод простых итераций (Якоби): x_new = x + (b - Ax) / diag(A),
+    одно умножение матрицы на вектор за итерацию. A может быть плотной или CSR.
+
+    При return_history=True возвращает (x, история норм невязки ||b - Ax||).
+    """
     if not is_diagonally_dominant(A):
         print("Warning: Matrix A is not diagonally dominant. Convergence might not be guaranteed.")
 
-    n = len(b)
-    x = np.zeros(n)
+    A = _as_matrix(A)
+    b = np.asarray(b, float)
+    diag = A.diagonal()
+    x = np.zeros(len(b)) if x0 is None else np.array(x0, float)
+    history = []
     for _ in range(max_iterations):
-        new_x = np.zeros(n)
-        for i in range(n):
-            s1 = sum(A[i][j] * x[j] for j in range(n) if j != i)
-            new_x[i] = (b[i] - s1) / A[i][i]
+        r = b - A @ x
+        history.append(np.linalg.norm(r))
+        step = r / diag
+        x += step
 
-        if np.linalg.norm(new_x - x) < tol:
-            return new_x
+        if np.linalg.norm(step) < tol:
+            break
 
-        if np.any(np.abs(new_x) > 1e50):
+        if np.any(np.abs(x) > 1e50):
             print("Warning: Method seems to be diverging. Stopping iterations.")
-            return new_x
-
-        x = new_x
-    return x
-
-
-def метод_зейделя(A, b, max_iterations=1000, tol=1e-10):
+            break
+
+    return (x, history) if return_history else x
+
+
+def метод_зейделя(A, b, max_iterations=1000, tol=1e-10, x0=None, omega=1.0, return_history=False, callback=None,
+                  return_result=False):
+    """
+    Метод Зейделя; при omega != 1 - метод последовательной верхней релаксации (SOR).
+    Приближение обновляется на месте в заранее выделенных буферах.
+    Для CSR-матрицы каждая итерация - решение разреженной нижнетреугольной системы
+    (D + omega L) x_new = omega b - (omega U + (omega - 1) D) x.
+
+    При return_history=True возвращает (x, история норм невязки ||b - Ax||).
+    callback(итерация, x, ||x - x_prev||) вызывается на каждой итерации (x - рабочий буфер, не копия).
+    При return_result=True возвращает SolverResult с историей ||x - x_prev||.
+    """
+    start = time.perf_counter()
+    steps = [] if return_result else None
+    observe = make_observer(callback, steps)
+    A = _as_matrix(A)
+    b = np.asarray(b, float)
     n = len(b)
-    x = np.zeros(n)
+    x = np.zeros(n) if x0 is None else np.array(x0, float)
+    x_old = np.empty(n)
+    history = []
+
+    if hasattr(A, 'tocsr'):
+        from scipy.sparse import diags, tril, triu
+        from scipy.sparse.linalg import spsolve_triangular
+        D = diags(A.diagonal())
+        lower = (D + omega * tril(A, k=-1)).tocsr()
+        upper = (omega * triu(A, k=1) + (omega - 1) * D).tocsr()
+
+        def sweep():
+            x[:] = spsolve_triangular(lower, omega * b - upper @ x, lower=True)
+    else:
+        diag = A.diagonal().copy()
+
+        def sweep():
+            for i in range(n):
+                x[i] += omega * (b[i] - A[i] @ x) / diag[i]
+
+    status = STATUS_MAX_ITERATIONS
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        np.copyto(x_old, x)
+        sweep()
+        if return_history:
+            history.append(np.linalg.norm(b - A @ x))
+
+        step = np.linalg.norm(x - x_old)
+        if observe:
+            observe(iteration, x, step)
+        if step < tol:
+            status = STATUS_CONVERGED
+            break
+
+    if return_result:
+        return SolverResult((x, history) if return_history else x, iteration, None, steps, start, status)
+    return (x, history) if return_history else x
+
+
+def _as_operator(A):
+    """Возвращает функцию v -> Av; A может быть матрицей, CSR или самой функцией (matrix-free)."""
+    if callable(A) and not hasattr(A, 'shape'):
+        return A
+    A = _as_matrix(A)
+    return lambda v: A @ v
+
+
+def jacobi_preconditioner(A):
+    """Предобусловливатель Якоби: r -> r / diag(A)."""
+    diag = _as_matrix(A).diagonal().copy()
+    return lambda r: r / diag
+
+
+def ilu0_preconditioner(A):
+    """
+    Неполное LU-разложение без заполнения ILU(0): L и U имеют тот же шаблон
+    ненулевых элементов, что и A. Для плотной A совпадает с LU без выбора главного элемента.
+    """
+    A = _as_matrix(A)
+    if not hasattr(A, 'tocsr'):
+        return lu_factor(A, pivoting=False).solve
+
+    from scipy.sparse import csr_matrix, tril, triu
+    from scipy.sparse.linalg import spsolve_triangular
+    A = A.copy()
+    A.sort_indices()
+    indptr, indices, data = A.indptr, A.indices, A.data
+    n = A.shape[0]
+    diag_pos = np.empty(n, dtype=int)
+    position = np.full(n, -1)
+    for i in range(n):
+        start, end = indptr[i], indptr[i + 1]
+        row = indices[start:end]
+        position[row] = np.arange(start, end)
+        for p in range(start, end):
+            k = row[p - start]
+            if k >= i:
+                break
+            # a_ik /= a_kk, затем a_ij -= a_ik * a_kj только для (i, j) из шаблона
+            data[p] /= data[diag_pos[k]]
+            for q in range(diag_pos[k] + 1, indptr[k + 1]):
+                pos = position[indices[q]]
+                if pos != -1:
+                    data[pos] -= data[p] * data[q]
+        diag_pos[i] = position[i]
+        if diag_pos[i] == -1 or data[diag_pos[i]] == 0:
+            raise np.linalg.LinAlgError(f"Нулевой диагональный элемент в строке {i}, ILU(0) невозможно")
+        position[row] = -1
+
+    LU = csr_matrix((data, indices, indptr), shape=A.shape)
+    L = tril(LU, k=-1, format='csr')
+    U = triu(LU, format='csr')
+
+    def apply(r):
+        y = spsolve_triangular(L, r, lower=True, unit_diagonal=True)
+        return spsolve_triangular(U, y, lower=False)
+
+    return apply
+
+
+def метод_сопряженных_градиентов(A, b, max_iterations=1000, tol=1e-10, x0=None, M=None, return_history=False):
+    """
+    Метод сопряженных градиентов для симметричных положительно определенных систем.
+    A - матрица (плотная или CSR) или функция v -> Av; M - предобусловливатель r -> M^-1 r.
+    Остановка по относительной невязке ||b - Ax|| <= tol * ||b||.
+
+    При return_history=True возвращает (x, история норм невязки).
+    """
+    matvec = _as_operator(A)
+    b = np.asarray(b, float)
+    x = np.zeros(len(b)) if x0 is None else np.array(x0, float)
+    threshold = tol * (np.linalg.norm(b) or 1.0)
+
+    r = b - matvec(x)
+    z = r if M is None else M(r)
+    p = z.copy()
+    rz = r @ z
+    history = [np.linalg.norm(r)]
     for _ in range(max_iterations):
-        new_x = np.copy(x)
-        for i in range(n):
-            s1 = sum(A[i][j] * new_x[j] for j in range(i))
-            s2 = sum(A[i][j] * x[j] for j in range(i + 1, n))
-            new_x[i] = (b[i] - s1 - s2) / A[i][i]
-
-        if np.linalg.norm(new_x - x) < tol:
-            return new_x
-
-        x = new_x
-    return x
-
-
-# Тестирование
-A = [
-    [2, 1, 3],
-    [1, 3, 2],
-    [1, 1, 2]
-]
-b = [1, 12, 0]
-
-# Defining a new diagonally dominant matrix and vector b
-A_diagonal_dominant = [
-    [4, 1, 0],
-    [1, 3, 1],
-    [0, 1, 4]
-]
-b_diagonal_dominant = [15, 10, 10]
-
-results = {
-    "Метод исключения": метод_исключения(A, b),
-    "Метод Гаусса с выбором": метод_гаусса_с_выбором(A, b),
-    "Метод Гаусса": метод_гаусса(A, b),
-    "Метод простых итераций": метод_простых_итераций(A_diagonal_dominant, b_diagonal_dominant),
-    "Метод Зейделя": метод_зейделя(A, b)
-}
-expected_solution = np.array([1, 3, -2])
-accuracy = {method: np.linalg.norm(result - expected_solution) for method, result in results.items()}
-
-pprint(results)
-pprint(accuracy)
-
-"""
-{'Метод Гаусса': array([ 8.,  6., -7.]),
- 'Метод Гаусса с выбором': array([ 8.,  6., -7.]),
- 'Метод Зейделя': array([ 8.,  6., -7.]),
- 'Метод исключения': array([ 8.,  6., -7.]),
- 'Метод простых итераций': array([3.375, 1.5  , 2.125])}
-{'Метод Гаусса': 9.1104335791443,
- 'Метод Гаусса с выбором': 9.1104335791443,
- 'Метод Зейделя': 9.11043357879617,
- 'Метод исключения': 9.1104335791443,
- 'Метод простых итераций': 4.990616194418483}
-"""
\ No newline at end of file
+        if history[-1] <= threshold:
+            break
+        Ap = matvec(p)
+        alpha = rz / (p @ Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        z = r if M is None else M(r)
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+        history.append(np.linalg.norm(r))
+
+    return (x, history) if return_history else x
+
+
+def метод_gmres(A, b, max_iterations=1000, tol=1e-10, x0=None, M=None, restart=30, return_history=False):
+    """
+    Метод GMRES с перезапуском через каждые restart итераций и правым предобусловливанием.
+    Подходит для несимметричных систем. Параметры как у метод_сопряженных_градиентов.
+    """
+    matvec = _as_operator(A)
+    precondition = (lambda v: v) if M is None else M
+    b = np.asarray(b, float)
+    n = len(b)
+    x = np.zeros(n) if x0 is None else np.array(x0, float)
+    threshold = tol * (np.linalg.norm(b) or 1.0)
+
+    # История, как у метод_сопряженных_градиентов: начальная невязка и невязка на каждой итерации
+    # (|g[j+1]| - норма невязки, которую дают вращения Гивенса без лишних умножений)
+    history = []
+    iterations = 0
+    while True:
+        r = b - matvec(x)
+        beta = np.linalg.norm(r)
+        if not history:
+            history.append(beta)
+        if beta <= threshold or iterations >= max_iterations:
+            break
+
+        V = np.zeros((restart + 1, n))
+        H = np.zeros((restart + 1, restart))
+        cs = np.zeros(restart)
+        sn = np.zeros(restart)
+        g = np.zeros(restart + 1)
+        g[0] = beta
+        V[0] = r / beta
+
+        for j in range(restart):
+            w = matvec(precondition(V[j]))
+            # Ортогонализация Грама-Шмидта с повторным проходом (CGS2)
+            for _ in range(2):
+                h = V[:j + 1] @ w
+                w -= V[:j + 1].T @ h
+                H[:j + 1, j] += h
+            H[j + 1, j] = np.linalg.norm(w)
+            breakdown = H[j + 1, j] == 0
+            if not breakdown:
+                V[j + 1] = w / H[j + 1, j]
+
+            # Приведение H к верхнетреугольному виду вращениями Гивенса
+            for i in range(j):
+                H[i, j], H[i + 1, j] = cs[i] * H[i, j] + sn[i] * H[i + 1, j], -sn[i] * H[i, j] + cs[i] * H[i + 1, j]
+            denominator = np.hypot(H[j, j], H[j + 1, j])
+            cs[j], sn[j] = H[j, j] / denominator, H[j + 1, j] / denominator
+            H[j, j], H[j + 1, j] = denominator, 0.0
+            g[j + 1] = -sn[j] * g[j]
+            g[j] = cs[j] * g[j]
+
+            iterations += 1
+            history.append(abs(g[j + 1]))
+            if abs(g[j + 1]) <= threshold or breakdown or iterations >= max_iterations:
+                break
+
+        k = j + 1
+        y = np.zeros(k)
+        for i in range(k - 1, -1, -1):
+            y[i] = (g[i] - H[i, i + 1:k] @ y[i + 1:]) / H[i, i]
+        x += precondition(V[:k].T @ y)
+
+    return (x, history) if return_history else x
+
+
+if __name__ == "__main__":
+    # Тестирование
+    A = [
+        [2, 1, 3],
+        [1, 3, 2],
+        [1, 1, 2]
+    ]
+    b = [1, 12, 0]
+
+    # Defining a new diagonally dominant matrix and vector b
+    A_diagonal_dominant = [
+        [4, 1, 0],
+        [1, 3, 1],
+        [0, 1, 4]
+    ]
+    b_diagonal_dominant = [15, 10, 10]
+
+    results = {
+        "Метод исключения": метод_исключения(A, b),
+        "Метод Гаусса с выбором": метод_гаусса_с_выбором(A, b),
+        "Метод Гаусса": метод_гаусса(A, b),
+        "Метод простых итераций": метод_простых_итераций(A_diagonal_dominant, b_diagonal_dominant),
+        "Метод Зейделя": метод_зейделя(A, b),
+        "Метод сопряженных градиентов": метод_сопряженных_градиентов(A_diagonal_dominant, b_diagonal_dominant),
+        "Метод GMRES": метод_gmres(A, b)
+    }
+    expected_solution = np.array([1, 3, -2])
+    accuracy = {method: np.linalg.norm(result - expected_solution) for method, result in results.items()}
+
+    pprint(results)
+    pprint(accuracy)
+
+    """
+    {'Метод Гаусса': array([ 8.,  6., -7.]),
+     'Метод Гаусса с выбором': array([ 8.,  6., -7.]),
+     'Метод Зейделя': array([ 8.,  6., -7.]),
+     'Метод исключения': array([ 8.,  6., -7.]),
+     'Метод простых итераций': array([3.375, 1.5  , 2.125])}
+    {'Метод Гаусса': 9.1104335791443,
+     'Метод Гаусса с выбором': 9.1104335791443,
+     'Метод Зейделя': 9.11043357879617,
+     'Метод исключения': 9.1104335791443,
+     'Метод простых итераций': 4.990616194418483}
+    """
@@ -1,24 +1,131 @@
 import numpy as np
 
+from cache import array_digest
+from out_of_core import load_array
+
 EPS = 1e-10
 
-def integral_smoothing(vars, vals, m, x):
+class LeastSquaresFit:
     """
-    Вычисление функции сглаживания.
+    Полином степени m, приближающий данные по методу наименьших квадратов.
+    Данные можно подавать частями (partial_fit), храня только накопленные величины:
+    - method='normal': степенные суммы sum x^k (k <= 2m) и sum y x^i для нормальных уравнений;
+    - method='qr': треугольный множитель R QR-разложения матрицы [V | y],
+      обновляемый по каждой порции данных (устойчиво для плохо обусловленных задач).
+    basis='chebyshev' использует полиномы Чебышева на отрезке domain вместо степеней x,
+    что избавляет от плохой обусловленности матрицы Вандермонда.
     """
-    n = len(vars)
-    A = np.zeros((m + 1, m + 1))
-    b = np.zeros(m + 1)
-
-    for i in range(m + 1):
-        for j in range(m + 1):
-            A[i, j] = sum(vars ** (i + j))
-
-        b[i] = sum(vals * (vars ** i))
 
-    coefs = np.linalg.solve(A, b)
-
-    return sum(coefs[index] * (x ** index) for index in range(len(coefs)))
+    def __init__(self, m, method='normal', basis='monomial', domain=None, chunk_size=2 ** 16):
+        if method not in ('normal', 'qr'):
+            raise ValueError(f"Неизвестный метод: {method}")
+        if basis not in ('monomial', 'chebyshev'):
+            raise ValueError(f"Неизвестный базис: {basis}")
+        self.m = m
+        self.method = method
+        self.basis = basis
+        self.domain = domain
+        self.chunk_size = chunk_size
+        self.n = 0
+        self._coefs = None
+        if method == 'normal' and basis == 'monomial':
+            self.power_sums = np.zeros(2 * m + 1)
+            self.moments = np.zeros(m + 1)
+        elif method == 'normal':
+            self.gram = np.zeros((m + 1, m + 1))
+            self.moments = np.zeros(m + 1)
+        else:
+            self.R = np.zeros((0, m + 2))
+
+    def _basis_matrix(self, x, degree):
+        """Значения базисных функций 0..degree в точках x (по столбцам)."""
+        x = np.asarray(x, dtype=float)
+        if self.basis == 'chebyshev':
+            a, b = self.domain
+            x = (2 * x - (a + b)) / (b - a)
+        V = np.empty(x.shape + (degree + 1,))
+        V[..., 0] = 1
+        if degree > 0:
+            V[..., 1] = x
+        for k in range(2, degree + 1):
+            if self.basis == 'chebyshev':
+                V[..., k] = 2 * x * V[..., k - 1] - V[..., k - 2]
+            else:
+                V[..., k] = x * V[..., k - 1]
+        return V
+
+    def partial_fit(self, vars, vals):
+        """
+        Добавляет порцию данных; большие массивы обрабатываются блоками по chunk_size.
+        vars и vals могут быть np.memmap или путями к файлам .npy - в память читается
+        только текущий блок.
+        """
+        vars = load_array(vars)
+        vals = load_array(vals)
+        if self.basis == 'chebyshev' and self.domain is None:
+            # Без заданного отрезка берется отрезок первой порции данных
+            self.domain = (float(vars.min()), float(vars.max()))
+        for start in range(0, len(vars), self.chunk_size):
+            x = np.asarray(vars[start:start + self.chunk_size], dtype=float)
+            y = np.asarray(vals[start:start + self.chunk_size], dtype=float)
+            if self.method == 'qr':
+                V = self._basis_matrix(x, self.m)
+                stacked = np.vstack([self.R, np.column_stack([V, y])])
+                self.R = np.linalg.qr(stacked, mode='r')
+            elif self.basis == 'monomial':
+                P = self._basis_matrix(x, 2 * self.m)
+                self.power_sums += P.sum(axis=0)
+                self.moments += y @ P[:, :self.m + 1]
+            else:
+                V = self._basis_matrix(x, self.m)
+                self.gram += V.T @ V
+                self.moments += y @ V
+            self.n += len(x)
+        self._coefs = None
+        return self
+
+    @property
+    def coefs(self):
+        """Коэффициенты полинома в выбранном базисе (по возрастанию степени)."""
+        if self._coefs is None:
+            m = self.m
+            if self.method == 'qr':
+                R = np.zeros((m + 2, m + 2))
+                R[:len(self.R)] = self.R[:m + 2]
+                self._coefs = np.linalg.solve(R[:m + 1, :m + 1], R[:m + 1, m + 1])
+            else:
+                if self.basis == 'monomial':
+                    index = np.arange(m + 1)
+                    A = self.power_sums[index[:, None] + index[None, :]]
+                else:
+                    A = self.gram
+                self._coefs = np.linalg.solve(A, self.moments)
+        return self._coefs
+
+    def __call__(self, x):
+        """Значение сглаживающего полинома в точке или массиве точек x."""
+        coefs = self.coefs
+        x = np.asarray(x, dtype=float)
+        if self.basis == 'chebyshev':
+            result = self._basis_matrix(x, self.m) @ coefs
+        else:
+            result = np.full(x.shape, coefs[-1])
+            for c in coefs[-2::-1]:
+                result = result * x + c
+        return result if result.ndim else float(result)
+
+
+def integral_smoothing(vars, vals, m, x, cache=None):
+    """
+    Вычисление функции сглаживания.
+    cache - ArrayCache: коэффициенты для тех же данных и m берутся из кэша.
+    """
+    fit = LeastSquaresFit(m)
+    if cache is None:
+        return fit.partial_fit(vars, vals)(x)
+    key = array_digest(load_array(vars), load_array(vals), function='integral_smoothing', m=m)
+    fit._coefs = cache.cached(key, lambda: {'coefs': fit.partial_fit(vars, vals).coefs})['coefs']
+    return fit(x)
 
 
 # Функция для тестирования
@@ -51,17 +158,18 @@ def test_integral_smoothing():
 
     print("Все тесты успешно пройдены!")
 
-# Тестовые данные
-variables_lesson = np.array([0, 1, 2, 4], dtype=float)
-values_lesson = np.array([0, 1, 4, 2], dtype=float)
+if __name__ == "__main__":
+    # Тестовые данные
+    variables_lesson = np.array([0, 1, 2, 4], dtype=float)
+    values_lesson = np.array([0, 1, 4, 2], dtype=float)
 
-variables_sw = np.array([0, 1, 2, 3], dtype=float)
-values_sw = np.array([0, 2, 5, 3], dtype=float)
+    variables_sw = np.array([0, 1, 2, 3], dtype=float)
+    values_sw = np.array([0, 2, 5, 3], dtype=float)
 
-print("\nЗначение функции сглаживания на сетке для совместного решения при x = 1.5 и m = 1:", 
-      round(integral_smoothing(variables_lesson, values_lesson, 1, 1.5), 3))
-print("Значение функции сглаживания на сетке для самостоятельного решения при x = 1.5 и m = 1:", 
-      round(integral_smoothing(variables_sw, values_sw, 1, 1.5), 3))
+    print("\nЗначение функции сглаживания на сетке для совместного решения при x = 1.5 и m = 1:", 
+          round(integral_smoothing(variables_lesson, values_lesson, 1, 1.5), 3))
+    print("Значение функции сглаживания на сетке для самостоятельного решения при x = 1.5 и m = 1:", 
+          round(integral_smoothing(variables_sw, values_sw, 1, 1.5), 3))
 
-# Вызов функции тестирования
-test_integral_smoothing()
\ No newline at end of file
+    # Вызов функции тестирования
+    test_integral_smoothing()
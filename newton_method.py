@@ -1,110 +1,655 @@
-import sympy as sp
+import functools
+import numpy as np
+import time
 from pprint import pprint
 
+from parallel import parallel_map
+from solver_result import (STATUS_CONVERGED, STATUS_DIVERGED, STATUS_MAX_ITERATIONS, STATUS_NO_SIGN_CHANGE,
+                           STATUS_ZERO_DERIVATIVE, SolverResult, make_observer)
+
+# Доступные способы вычисления функции и производной
+BACKENDS = ('math', 'numpy', 'sympy')
+
+# Машинный эпсилон для относительной точности по x
+MACHINE_EPS = float(np.finfo(float).eps)
+
+
+def horner(coefficients, x):
+    """
+    Значения полинома и его производной схемой Горнера за один проход.
+
+    Параметры:
+    - coefficients: массив (..., степень + 1), старший коэффициент первым;
+      ведущие оси - разные полиномы одной степени
+    - x: точки, форма согласуется с coefficients[..., 0] по правилам broadcasting
+
+    Возвращает:
+    - p, dp: значения полинома и производной
+    """
+    coefficients = np.asarray(coefficients)
+    p = np.zeros(np.broadcast_shapes(coefficients.shape[:-1], np.shape(x)),
+                 dtype=np.result_type(coefficients, x, float))
+    dp = np.zeros_like(p)
+    for k in range(coefficients.shape[-1]):
+        dp = dp * x + p
+        p = p * x + coefficients[..., k]
+    return p, dp
+
+
+def polynomial_roots(coefficients, method='companion', tol=1e-12, max_iterations=100):
+    """
+    Все корни полиномов одной степени, сразу для всего пакета.
+
+    Параметры:
+    - coefficients: массив (степень + 1,) или (batch, степень + 1), старший коэффициент первым
+    - method: 'companion' - собственные значения сопровождающих матриц (один вызов
+      np.linalg.eigvals для всего пакета); 'aberth' - одновременные итерации
+      Аберта-Эрлиха для всех корней всех полиномов
+    - tol: относительная точность поправки для 'aberth'
+    - max_iterations: максимальное количество итераций для 'aberth'
+
+    Возвращает:
+    - комплексный массив корней (степень,) или (batch, степень)
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    single = coefficients.ndim == 1
+    coefficients = np.atleast_2d(coefficients)
+    if np.any(coefficients[:, 0] == 0):
+        raise ValueError("Старший коэффициент полинома равен нулю")
+    batch, degree = coefficients.shape[0], coefficients.shape[1] - 1
+    monic = coefficients[:, 1:] / coefficients[:, :1]
+
+    if degree == 0:
+        roots = np.empty((batch, 0), dtype=complex)
+    elif method == 'companion':
+        companion = np.zeros((batch, degree, degree))
+        companion[:, 0, :] = -monic
+        companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1.0
+        roots = np.linalg.eigvals(companion).astype(complex)
+    elif method == 'aberth':
+        roots = _aberth(np.hstack([np.ones((batch, 1)), monic]), tol, max_iterations)
+    else:
+        raise ValueError(f"Неизвестный метод: {method}")
+    return roots[0] if single else roots
+
+
+def _aberth(monic, tol, max_iterations):
+    """Итерации Аберта-Эрлиха для приведенных полиномов (batch, степень + 1)."""
+    batch, degree = monic.shape[0], monic.shape[1] - 1
+    # Начальные приближения на окружности радиуса max |a_k|^(1/k) (все корни внутри
+    # окружности вдвое большего радиуса), угол сдвинут, чтобы не попасть на ось симметрии
+    radius = np.max(np.abs(monic[:, 1:]) ** (1.0 / np.arange(1, degree + 1)), axis=1)
+    radius = np.where(radius > 0, radius, 1.0)
+    angles = 2 * np.pi * np.arange(degree) / degree + 0.4
+    roots = radius[:, None] * np.exp(1j * angles) - monic[:, 1:2] / degree
+
+    active = np.arange(batch)
+    off_diagonal = ~np.eye(degree, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(max_iterations):
+            z = roots[active]
+            p, dp = horner(monic[active, None, :], z)
+            ratio = np.where(p == 0, 0, p / dp)
+            differences = z[:, :, None] - z[:, None, :]
+            repulsion = np.sum(np.where(off_diagonal, 1 / differences, 0), axis=2)
+            correction = ratio / (1 - ratio * repulsion)
+            correction = np.where(np.isfinite(correction), correction, 0)
+            roots[active] = z - correction
+
+            # Продолжают итерации только полиномы, у которых не сошелся хотя бы один корень
+            done = np.all(np.abs(correction) <= tol * np.maximum(np.abs(z), 1), axis=1)
+            active = active[~done]
+            if active.size == 0:
+                break
+    return roots
+
+
 class Function:
-    def __init__(self, function, is_polynomial=False):
-        x = sp.symbols('x')
+    def __init__(self, function, is_polynomial=False, backend='math', cache_size=0):
+        if backend not in BACKENDS:
+            raise ValueError(f"Неизвестный backend: {backend}, допустимые: {BACKENDS}")
         self.is_polynomial = is_polynomial
+        self.backend = backend
+        self._function = self._derivative = None
         if is_polynomial:
-            self.function = sum(c * x**i for i, c in enumerate(reversed(function)))  # создание полинома
+            # Полином считается схемой Горнера по коэффициентам; выражение sympy
+            # строится только для backend='sympy' или при обращении к function/derivative
+            self.coefficients = np.asarray(function, dtype=float)  # старший коэффициент первым
+        else:
+            import sympy as sp  # загружается только для символьной функции: импорт модуля остается быстрым
+            self._function = sp.sympify(function)  # преобразование строки в функцию
+
+        self.cache_size = cache_size
+        self._compile()
+
+    @property
+    def function(self):
+        if self._function is None:
+            import sympy as sp
+            x = sp.Symbol('x')
+            self._function = sum(c * x**i for i, c in enumerate(reversed(self.coefficients.tolist())))  # создание полинома
+        return self._function
+
+    @property
+    def derivative(self):
+        if self._derivative is None:
+            import sympy as sp
+            self._derivative = sp.diff(self.function, sp.Symbol('x'))  # вычисление производной
+        return self._derivative
+
+    def _compile(self):
+        # Способ вычисления выбирается один раз: evaluate, derivative_eval и
+        # evaluate_with_derivative - замыкания без проверок backend на каждом вызове
+        if self.is_polynomial and self.backend != 'sympy':
+            # Полином: p и p' схемой Горнера за один проход по коэффициентам
+            self._coefficients = coefficients = tuple(self.coefficients.tolist())
+
+            def f(x):
+                p = 0.0
+                for c in coefficients:
+                    p = p * x + c
+                return p
+
+            def df(x):
+                return fdf(x)[1]
+            fdf = self._horner
+        elif self.backend != 'sympy':
+            import sympy as sp
+            x = sp.Symbol('x')
+            # Компиляция функции и производной один раз при создании объекта
+            f = sp.lambdify(x, self.function, modules=self.backend)
+            df = sp.lambdify(x, self.derivative, modules=self.backend)
+            # f и f' с общими подвыражениями (например, sin(x) и exp(x))
+            fdf = sp.lambdify(x, (self.function, self.derivative), modules=self.backend, cse=True)
+        else:
+            f = df = fdf = None
+        self._f, self._df, self._fdf = f, df, fdf
+        self._fdf_numpy = None
+
+        if self.backend == 'sympy':
+            self._evaluate = self._evaluate_sympy
+            self.derivative_eval = self._derivative_eval_sympy
+            self.evaluate_with_derivative = lambda x: (self._evaluate(x), self.derivative_eval(x))
+        elif self.backend == 'numpy':
+            # numpy возвращает np.float64, приводим к float
+            def evaluate(x):
+                self.n_evaluations += 1
+                return float(f(x))
+
+            def derivative_eval(x):
+                self.n_derivative_evaluations += 1
+                return float(df(x))
+
+            def evaluate_with_derivative(x):
+                self.n_evaluations += 1
+                self.n_derivative_evaluations += 1
+                fx, dfx = fdf(x)
+                return float(fx), float(dfx)
+            self._evaluate, self.derivative_eval, self.evaluate_with_derivative = (
+                evaluate, derivative_eval, evaluate_with_derivative)
         else:
-            self.function = sp.sympify(function)  # преобразование строки в функцию
-        self.derivative = sp.diff(self.function, x)  # вычисление производной
+            # math и полином (Горнер) уже возвращают float для вещественного x
+            def evaluate(x):
+                self.n_evaluations += 1
+                return f(x)
+
+            def derivative_eval(x):
+                self.n_derivative_evaluations += 1
+                return df(x)
+
+            def evaluate_with_derivative(x):
+                self.n_evaluations += 1
+                self.n_derivative_evaluations += 1
+                return fdf(x)
+            self._evaluate, self.derivative_eval, self.evaluate_with_derivative = (
+                evaluate, derivative_eval, evaluate_with_derivative)
+
+        # Счетчики вычислений, сбрасываются в начале каждого метода
+        self.n_evaluations = 0
+        self.n_derivative_evaluations = 0
+        # Необязательный LRU-кэш значений f по x
+        if self.cache_size:
+            self.evaluate = functools.lru_cache(maxsize=self.cache_size)(self._evaluate)
+        else:
+            self.evaluate = self._evaluate
+
+    def __getstate__(self):
+        # Скомпилированные функции не сериализуются pickle: передаются только выражения
+        # (для полинома - коэффициенты), компиляция повторяется в процессе-получателе
+        keys = ('_function', '_derivative', 'is_polynomial', 'backend', 'cache_size')
+        if self.is_polynomial:
+            keys += ('coefficients',)
+        return {key: self.__dict__[key] for key in keys}
 
-    def evaluate(self, x):
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    def _horner(self, x):
+        p = dp = 0.0
+        for c in self._coefficients:
+            dp = dp * x + p
+            p = p * x + c
+        return p, dp
+
+    def reset_counters(self):
+        self.n_evaluations = 0
+        self.n_derivative_evaluations = 0
+
+    def _evaluate_sympy(self, x):
+        import sympy as sp
+        self.n_evaluations += 1
         return float(self.function.evalf(subs={sp.Symbol('x'): x}))  # оценка функции
 
-    def derivative_eval(self, x):
+    def _derivative_eval_sympy(self, x):
+        import sympy as sp
+        self.n_derivative_evaluations += 1
         return float(self.derivative.evalf(subs={sp.Symbol('x'): x}))  # оценка производной
 
+    def _evaluate_batch(self, x, coefficients=None):
+        """
+        Вычисляет f и f' для массива точек x.
+        Для полинома с массивом коэффициентов coefficients (batch, степень + 1)
+        значения считаются схемой Горнера, своя строка коэффициентов на каждую точку.
+        """
+        if coefficients is not None:
+            return horner(coefficients, x)
+        if self.is_polynomial:
+            return horner(self.coefficients, x)
+        if self._fdf_numpy is None:
+            import sympy as sp
+            self._fdf_numpy = sp.lambdify(sp.Symbol('x'), (self.function, self.derivative), modules='numpy', cse=True)
+        fx, dfx = self._fdf_numpy(x)
+        # Константы lambdify возвращает скаляром
+        return np.broadcast_to(fx, x.shape), np.broadcast_to(dfx, x.shape)
+
     # Метод Ньютона
-    def newton_method(self, x0, epsilon):
+    def newton_method(self, x0, epsilon, max_iterations=None, callback=None, return_result=False):
+        """
+        max_iterations ограничивает количество итераций (None - без ограничения).
+        callback(итерация, x, |f(x)|) вызывается на каждой итерации.
+        При return_result=True возвращает SolverResult с историей |f(x)|
+        и статусом STATUS_ZERO_DERIVATIVE или STATUS_MAX_ITERATIONS вместо строки с ошибкой.
+        """
+        start = time.perf_counter()
+        self.reset_counters()
+        history = [] if return_result else None
+        observe = make_observer(callback, history)
+        iteration = 0
         xn = x0
-        while abs(self.evaluate(xn)) > epsilon:
-            fxn = self.evaluate(xn)
-            dfxn = self.derivative_eval(xn)
-            if dfxn == 0:
-                return f"Производная равна нулю при x = {xn}, метод не работает."
+        fxn, dfxn = self.evaluate_with_derivative(xn)
+        while abs(fxn) > epsilon:
+            if dfxn == 0 or iteration == max_iterations:
+                if dfxn == 0:
+                    status, message = STATUS_ZERO_DERIVATIVE, f"Производная равна нулю при x = {xn}, метод не работает."
+                else:
+                    status, message = STATUS_MAX_ITERATIONS, f"Превышено максимальное количество итераций, x = {xn}."
+                if return_result:
+                    return SolverResult(xn, iteration, self.n_evaluations, history, start, status, message)
+                return message
             xn = xn - fxn / dfxn
+            fxn, dfxn = self.evaluate_with_derivative(xn)
+            iteration += 1
+            if observe:
+                observe(iteration, xn, abs(fxn))
+        if return_result:
+            return SolverResult(xn, iteration, self.n_evaluations, history, start)
         return xn
 
+    def all_roots(self, method='companion', tol=1e-12, max_iterations=100):
+        """Все (комплексные) корни полинома, см. polynomial_roots."""
+        if not self.is_polynomial:
+            raise ValueError("all_roots поддерживается только для полиномов")
+        return polynomial_roots(self.coefficients, method, tol, max_iterations)
+
+    # Пакетный метод Ньютона
+    def newton_method_batch(self, x0, epsilon, max_iterations=100, coefficients=None):
+        """
+        Метод Ньютона для массива начальных приближений, все задачи решаются одновременно.
+
+        Параметры:
+        - x0: массив начальных приближений
+        - epsilon: точность по |f(x)|
+        - max_iterations: максимальное количество итераций
+        - coefficients: (только для is_polynomial=True) массив коэффициентов формы
+          (batch, степень + 1), старший коэффициент первым, по одной строке на задачу
+
+        Возвращает:
+        - roots: найденные корни (форма как у x0)
+        - iterations: количество итераций для каждой задачи
+        - status: коды завершения STATUS_* для каждой задачи
+        """
+        x0 = np.asarray(x0, dtype=float)
+        if coefficients is not None:
+            if not self.is_polynomial:
+                raise ValueError("coefficients поддерживаются только для полиномов")
+            coefficients = np.asarray(coefficients, dtype=float)
+            x0 = np.broadcast_to(x0, coefficients.shape[:1])
+
+        shape = x0.shape
+        roots = x0.ravel().copy()
+        iterations = np.zeros(roots.size, dtype=int)
+        status = np.full(roots.size, STATUS_MAX_ITERATIONS)
+        active = np.arange(roots.size)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for k in range(max_iterations + 1):
+                fx, dfx = self._evaluate_batch(roots[active], None if coefficients is None else coefficients[active])
+                converged = np.abs(fx) <= epsilon
+                diverged = ~np.isfinite(fx) | ~np.isfinite(dfx)
+                zero_derivative = ~converged & ~diverged & (dfx == 0)
+                status[active[converged]] = STATUS_CONVERGED
+                status[active[diverged]] = STATUS_DIVERGED
+                status[active[zero_derivative]] = STATUS_ZERO_DERIVATIVE
+
+                # Продолжают итерации только несошедшиеся задачи
+                keep = ~(converged | diverged | zero_derivative)
+                active = active[keep]
+                if active.size == 0 or k == max_iterations:
+                    break
+                roots[active] -= fx[keep] / dfx[keep]
+                iterations[active] += 1
+
+        return roots.reshape(shape), iterations.reshape(shape), status.reshape(shape)
+
     # Упрощенный метод Ньютона
     def simplified_newton_method(self, x0, epsilon):
-        x1 = x0 - self.evaluate(x0) / self.derivative_eval(x0)
+        self.reset_counters()
+        fx0, dfx0 = self.evaluate_with_derivative(x0)
+        x1 = x0 - fx0 / dfx0
         xn = x1
-        while abs(self.evaluate(xn)) > epsilon:
-            fxn = self.evaluate(xn)
-            dfx0 = self.derivative_eval(x0)
+        fxn = self.evaluate(xn)
+        while abs(fxn) > epsilon:
             if dfx0 == 0:
                 return f"Производная равна нулю при x = {x0}, метод не работает."
             xn = xn - fxn / dfx0
+            fxn = self.evaluate(xn)
         return xn
 
     # Метод Ньютона-Броуера
     def newton_brower_method(self, x0, epsilon, c):
+        self.reset_counters()
         xn = x0
-        while abs(self.evaluate(xn)) > epsilon:
-            fxn = self.evaluate(xn)
-            dfxn = self.derivative_eval(xn)
+        fxn, dfxn = self.evaluate_with_derivative(xn)
+        while abs(fxn) > epsilon:
             if dfxn == 0:
                 return f"Производная равна нулю при x = {xn}, метод не работает."
             xn = xn - c * fxn / dfxn
+            fxn, dfxn = self.evaluate_with_derivative(xn)
         return xn
 
     # Метод секущих
     def secant_method(self, x0, epsilon, delta):
+        self.reset_counters()
         fx0 = self.evaluate(x0)
-        dfx0 = (self.evaluate(x0) - self.evaluate(x0 - delta)) / delta
+        dfx0 = (fx0 - self.evaluate(x0 - delta)) / delta
         if dfx0 == 0:
             return f"Производная равна нулю при x = {x0}, метод не работает."
         x1 = x0 - fx0 / dfx0
         xn = x1
-        while abs(self.evaluate(xn)) > epsilon:
-            dfxn = (self.evaluate(xn) - self.evaluate(xn - 1)) / (xn - (xn - 1))
+        fxn = self.evaluate(xn)
+        while abs(fxn) > epsilon:
+            dfxn = (fxn - self.evaluate(xn - 1)) / (xn - (xn - 1))
             if dfxn == 0:
                 return f"Производная равна нулю при x = {xn}, метод не работает."
-            xn = xn - self.evaluate(xn) / dfxn
+            xn = xn - fxn / dfxn
+            fxn = self.evaluate(xn)
         return xn
 
     # Метод хорд
     def chord_method(self, a, b, epsilon):
-        if self.evaluate(a) > 0:
-            x0 = b
+        self.reset_counters()
+        fa = self.evaluate(a)
+        fb = self.evaluate(b)
+        if fa > 0:
+            xn, fxn = b, fb
         else:
-            x0 = a
-        xn = x0
-        while abs(self.evaluate(xn)) > epsilon:
-            if self.evaluate(a) > 0:
-                denominator = (self.evaluate(xn) - self.evaluate(a))
+            xn, fxn = a, fa
+        while abs(fxn) > epsilon:
+            if fa > 0:
+                denominator = (fxn - fa)
                 if denominator == 0:
                     return f"Деление на ноль при x = {xn}, метод не работает."
-                xn = a - (self.evaluate(a) * (xn - a)) / denominator
+                xn = a - (fa * (xn - a)) / denominator
             else:
-                denominator = (self.evaluate(b) - self.evaluate(xn))
+                denominator = (fb - fxn)
                 if denominator == 0:
                     return f"Деление на ноль при x = {xn}, метод не работает."
-                xn = xn - (self.evaluate(xn) * (b - xn)) / denominator
+                xn = xn - (fxn * (b - xn)) / denominator
+            fxn = self.evaluate(xn)
         return xn
 
-# Тестирование каждого метода индивидуально для полиномиальных и неполиномиальных функций
-test_results = {}
-
-# Полиномиальная функция
-poly_func = Function([1, -6, 11, -6], is_polynomial=True)
-test_results['polynomial'] = {}
-test_results['polynomial']['newton_method'] = poly_func.newton_method(3, 1e-6)
-test_results['polynomial']['simplified_newton_method'] = poly_func.simplified_newton_method(3, 1e-6)
-test_results['polynomial']['newton_brower_method'] = poly_func.newton_brower_method(3, 1e-6, 1)
-test_results['polynomial']['secant_method'] = poly_func.secant_method(3, 1e-6, 0.01)
-test_results['polynomial']['chord_method'] = poly_func.chord_method(2, 3, 1e-6)
-
-# Неполиномиальная функция
-non_poly_func = Function("sin(x)/x + exp(x) - 1")
-test_results['non_polynomial'] = {}
-test_results['non_polynomial']['newton_method'] = non_poly_func.newton_method(0.5, 1e-6)
-test_results['non_polynomial']['simplified_newton_method'] = non_poly_func.simplified_newton_method(0.5, 1e-6)
-test_results['non_polynomial']['newton_brower_method'] = non_poly_func.newton_brower_method(0.5, 1e-6, 1)
-test_results['non_polynomial']['secant_method'] = non_poly_func.secant_method(0.5, 1e-6, 0.01)
-test_results['non_polynomial']['chord_method'] = non_poly_func.chord_method(0.1, 1, 1e-6)
-
-pprint(test_results)
+    def _bracket(self, a, b, start, return_result):
+        """
+        Проверяет, что f меняет знак на [a, b]. Возвращает (fa, fb, None) или
+        (None, None, результат метода) - корень на конце отрезка либо ошибку.
+        """
+        fa, fb = self.evaluate(a), self.evaluate(b)
+        if fa == 0 or fb == 0:
+            root = a if fa == 0 else b
+            return None, None, SolverResult(root, 0, self.n_evaluations, [], start) if return_result else root
+        if fa * fb > 0:
+            message = f"f имеет один знак на концах отрезка [{a}, {b}], метод не работает."
+            if return_result:
+                return None, None, SolverResult(None, 0, self.n_evaluations, [], start, STATUS_NO_SIGN_CHANGE, message)
+            return None, None, message
+        return fa, fb, None
+
+    # Метод Брента
+    def brent_method(self, a, b, epsilon=0.0, xtol=1e-12, max_iterations=100, callback=None, return_result=False):
+        """
+        Метод Брента: обратная квадратичная интерполяция и секущие, с откатом
+        на деление пополам, если шаг интерполяции не уменьшает отрезок достаточно быстро.
+        Корень всегда остается внутри отрезка со сменой знака, поэтому метод сходится
+        не медленнее деления пополам.
+
+        Параметры:
+        - a, b: концы отрезка, f(a) и f(b) разных знаков
+        - epsilon: остановка при |f(x)| <= epsilon
+        - xtol: остановка, когда длина отрезка меньше xtol (плюс 4 машинных эпсилона от |x|)
+        - max_iterations: максимальное количество итераций
+        - callback: функция (итерация, x, длина отрезка)
+        - return_result: вернуть SolverResult
+
+        Возвращает корень или строку с ошибкой (SolverResult при return_result=True).
+        """
+        start = time.perf_counter()
+        self.reset_counters()
+        fa, fb, done = self._bracket(a, b, start, return_result)
+        if done is not None:
+            return done
+        history = [] if return_result else None
+        observe = make_observer(callback, history)
+
+        # x_cur - текущее приближение, x_blk - противоположный конец отрезка,
+        # x_pre - предыдущее приближение; s_cur и s_pre - два последних шага
+        x_pre, f_pre, x_cur, f_cur = a, fa, b, fb
+        x_blk, f_blk = x_pre, f_pre
+        s_pre = s_cur = x_cur - x_pre
+        status = STATUS_MAX_ITERATIONS
+        iteration = 0
+        for iteration in range(1, max_iterations + 1):
+            if f_pre * f_cur < 0:
+                x_blk, f_blk = x_pre, f_pre
+                s_pre = s_cur = x_cur - x_pre
+            if abs(f_blk) < abs(f_cur):
+                x_pre, x_cur, x_blk = x_cur, x_blk, x_cur
+                f_pre, f_cur, f_blk = f_cur, f_blk, f_cur
+
+            delta = (xtol + 4 * MACHINE_EPS * abs(x_cur)) / 2
+            s_bis = (x_blk - x_cur) / 2
+            if observe:
+                observe(iteration, x_cur, abs(x_blk - x_cur))
+            if abs(f_cur) <= epsilon or abs(s_bis) < delta:
+                status = STATUS_CONVERGED
+                break
+
+            if abs(s_pre) > delta and abs(f_cur) < abs(f_pre):
+                if x_pre == x_blk:
+                    # Секущая
+                    s_try = -f_cur * (x_cur - x_pre) / (f_cur - f_pre)
+                else:
+                    # Обратная квадратичная интерполяция
+                    d_pre = (f_pre - f_cur) / (x_pre - x_cur)
+                    d_blk = (f_blk - f_cur) / (x_blk - x_cur)
+                    s_try = -f_cur * (f_blk * d_blk - f_pre * d_pre) / (d_blk * d_pre * (f_blk - f_pre))
+                if 2 * abs(s_try) < min(abs(s_pre), 3 * abs(s_bis) - delta):
+                    s_pre, s_cur = s_cur, s_try
+                else:
+                    s_pre = s_cur = s_bis
+            else:
+                s_pre = s_cur = s_bis
+
+            x_pre, f_pre = x_cur, f_cur
+            x_cur += s_cur if abs(s_cur) > delta else (delta if s_bis > 0 else -delta)
+            f_cur = self.evaluate(x_cur)
+            if f_cur == 0:
+                status = STATUS_CONVERGED
+                break
+
+        if return_result:
+            message = '' if status == STATUS_CONVERGED else "Превышено максимальное количество итераций."
+            return SolverResult(x_cur, iteration, self.n_evaluations, history, start, status, message)
+        return x_cur
+
+    # Метод хорд с модификацией Illinois
+    def illinois_method(self, a, b, epsilon=0.0, xtol=1e-12, max_iterations=100, callback=None, return_result=False):
+        """
+        Метод хорд (regula falsi) с модификацией Illinois: если один и тот же конец отрезка
+        сохраняется два шага подряд, значение f на нем делится пополам. Так оба конца
+        движутся к корню и сходимость сверхлинейная, а не линейная, как в chord_method.
+
+        Параметры и возвращаемое значение - как у brent_method;
+        callback получает (итерация, x, длина отрезка).
+        """
+        start = time.perf_counter()
+        self.reset_counters()
+        fa, fb, done = self._bracket(a, b, start, return_result)
+        if done is not None:
+            return done
+        history = [] if return_result else None
+        observe = make_observer(callback, history)
+
+        side = 0  # какой конец сохранился на прошлом шаге: -1 - a, +1 - b
+        status = STATUS_MAX_ITERATIONS
+        iteration = 0
+        c = a
+        for iteration in range(1, max_iterations + 1):
+            c = (a * fb - b * fa) / (fb - fa)
+            fc = self.evaluate(c)
+            if fc * fb > 0:
+                b, fb = c, fc
+                if side == -1:
+                    fa /= 2
+                side = -1
+            elif fc * fa > 0:
+                a, fa = c, fc
+                if side == +1:
+                    fb /= 2
+                side = +1
+            if observe:
+                observe(iteration, c, abs(b - a))
+            if fc == 0 or abs(fc) <= epsilon or abs(b - a) < xtol + 4 * MACHINE_EPS * abs(c):
+                status = STATUS_CONVERGED
+                break
+
+        if return_result:
+            message = '' if status == STATUS_CONVERGED else "Превышено максимальное количество итераций."
+            return SolverResult(c, iteration, self.n_evaluations, history, start, status, message)
+        return c
+
+# Вызовы методов для тестовых функций: {название: (метод, аргументы)}
+POLYNOMIAL_CASES = {
+    'newton_method': ('newton_method', (3, 1e-6)),
+    'simplified_newton_method': ('simplified_newton_method', (3, 1e-6)),
+    'newton_brower_method': ('newton_brower_method', (3, 1e-6, 1)),
+    'secant_method': ('secant_method', (3, 1e-6, 0.01)),
+    'chord_method': ('chord_method', (2, 3, 1e-6)),
+    'brent_method': ('brent_method', (2.5, 4, 1e-6)),
+    'illinois_method': ('illinois_method', (2.5, 4, 1e-6)),
+}
+NON_POLYNOMIAL_CASES = {
+    'newton_method': ('newton_method', (0.5, 1e-6)),
+    'simplified_newton_method': ('simplified_newton_method', (0.5, 1e-6)),
+    'newton_brower_method': ('newton_brower_method', (0.5, 1e-6, 1)),
+    'secant_method': ('secant_method', (0.5, 1e-6, 0.01)),
+    'chord_method': ('chord_method', (0.1, 1, 1e-6)),
+    'brent_method': ('brent_method', (-2, -1, 1e-6)),
+    'illinois_method': ('illinois_method', (-2, -1, 1e-6)),
+}
+
+
+def _run_method(task):
+    function, method, args = task
+    return getattr(function, method)(*args)
+
+
+def run_methods(function, cases, workers=1, backend='process'):
+    """
+    Запускает несколько методов для одной функции, при workers > 1 - параллельно.
+
+    Параметры:
+    - function: объект Function
+    - cases: словарь {название: (имя метода, аргументы)}
+    - workers: количество процессов (None - все ядра)
+    - backend: 'process' или 'thread'
+
+    Возвращает словарь {название: результат} в порядке cases.
+    """
+    tasks = [(function, method, args) for method, args in cases.values()]
+    return dict(zip(cases, parallel_map(_run_method, tasks, workers, backend)))
+
+
+def benchmark_methods(function, is_polynomial=False, repeat=20, backends=BACKENDS):
+    """
+    Сравнивает время работы пяти методов для разных способов вычисления функции.
+
+    Возвращает словарь {метод: {backend: среднее время в секундах}},
+    для компилированных backend'ов добавляется ускорение относительно sympy.
+    """
+    cases = POLYNOMIAL_CASES if is_polynomial else NON_POLYNOMIAL_CASES
+
+    functions = {backend: Function(function, is_polynomial, backend) for backend in backends}
+    results = {}
+    for name, (method, args) in cases.items():
+        results[name] = {}
+        for backend, F in functions.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                getattr(F, method)(*args)
+            results[name][backend] = (time.perf_counter() - start) / repeat
+        if 'sympy' in results[name]:
+            for backend in functions:
+                if backend != 'sympy':
+                    results[name][f'speedup_{backend}'] = results[name]['sympy'] / results[name][backend]
+    return results
+
+if __name__ == "__main__":
+    # Тестирование каждого метода индивидуально для полиномиальных и неполиномиальных функций
+    test_results = {}
+
+    # Полиномиальная функция
+    poly_func = Function([1, -6, 11, -6], is_polynomial=True)
+    test_results['polynomial'] = run_methods(poly_func, POLYNOMIAL_CASES)
+
+    # Неполиномиальная функция
+    non_poly_func = Function("sin(x)/x + exp(x) - 1")
+    test_results['non_polynomial'] = run_methods(non_poly_func, NON_POLYNOMIAL_CASES)
+
+    pprint(test_results)
+
+    # Количество вычислений f в последнем запуске метода
+    non_poly_func.chord_method(0.1, 1, 1e-6)
+    print("Вычислений f в методе хорд:", non_poly_func.n_evaluations)
+
+    # Пакетное решение: много начальных приближений и много полиномов x^2 - a
+    roots, iterations, status = non_poly_func.newton_method_batch(np.linspace(-3, 3, 7), 1e-6)
+    pprint({'roots': roots, 'iterations': iterations, 'status': status})
+    a = np.linspace(1, 10, 5)
+    quadratic_coefs = np.column_stack([np.ones_like(a), np.zeros_like(a), -a])
+    roots, iterations, status = Function([1, 0, -1], is_polynomial=True).newton_method_batch(3.0, 1e-10, coefficients=quadratic_coefs)
+    pprint({'roots': roots, 'sqrt(a)': np.sqrt(a), 'status': status})
+
+    # Сравнение скорости: sympy evalf против компилированных функций
+    pprint(benchmark_methods([1, -6, 11, -6], is_polynomial=True))
+    pprint(benchmark_methods("sin(x)/x + exp(x) - 1"))
@@ -2,84 +2,310 @@
 # с использованием равноотстоящих узлов и узлов Чебышева
 
 import numpy as np
-import matplotlib.pyplot as plt
 
-# Исходные данные
-x_values = np.array([0, 1, 2, 3])
-f_values = np.array([1, 2, 4, 1])
+from cache import array_digest
 
 # Функции для вычисления разделенных разностей и полинома Ньютона
-def divided_differences(x, f):
+def divided_differences(x, f, cache=None):
+    # cache - ArrayCache: таблица для тех же узлов и значений берется из кэша
+    x = np.asarray(x, dtype=float)
+    if cache is not None:
+        key = array_digest(x, np.asarray(f, dtype=float), function='divided_differences')
+        return cache.cached(key, lambda: {'table': divided_differences(x, f)})['table']
     n = len(f)
     coef = np.zeros([n, n])
     coef[:,0] = f
     
     for j in range(1, n):
-        for i in range(n-j):
-            coef[i][j] = (coef[i+1][j-1] - coef[i][j-1]) / (x[i+j]-x[i])
+        coef[:n-j, j] = (coef[1:n-j+1, j-1] - coef[:n-j, j-1]) / (x[j:] - x[:n-j])
     return coef
 
+def _newton_differences(x, f):
+    """
+    Разделенные разности за O(n) памяти: один вектор обновляется на месте по столбцам таблицы.
+    Возвращает коэффициенты формы Ньютона f[x_0..x_k] и "диагональ" f[x_k..x_{n-1}],
+    нужную для добавления узлов.
+    """
+    x = np.asarray(x, dtype=float)
+    c = np.array(f, dtype=float)
+    n = len(c)
+    diagonal = np.empty(n)
+    if n:
+        diagonal[n-1] = c[n-1]
+    for j in range(1, n):
+        c[j:] = (c[j:] - c[j-1:-1]) / (x[j:] - x[:-j])
+        diagonal[n-1-j] = c[n-1]
+    return c, diagonal
+
+def newton_coefficients(x, f):
+    """Коэффициенты интерполяционного полинома Ньютона (первая строка таблицы разностей)."""
+    return _newton_differences(x, f)[0]
+
 def newton_polynomial(x, coef, x_point):
+    # Схема Горнера; x_point может быть массивом точек
     n = len(x) - 1
     p = coef[n]
     for k in range(1, n+1):
         p = coef[n-k] + (x_point - x[n-k])*p
     return p
 
-# Расчет разделенных разностей для исходного набора значений
-coef = divided_differences(x_values, f_values)
+class NewtonInterpolator:
+    """
+    Интерполяционный полином Ньютона с добавлением узлов за O(n):
+    хранятся коэффициенты f[x_0..x_k] и разности f[x_k..x_{n-1}] с последним узлом.
+    """
+
+    def __init__(self, x, f):
+        self.x = np.array(x, dtype=float)
+        self.coef, self._diagonal = _newton_differences(self.x, f)
+
+    def add_node(self, x_new, f_new):
+        n = len(self.x)
+        diagonal = np.empty(n + 1)
+        diagonal[n] = f_new
+        for k in range(n - 1, -1, -1):
+            diagonal[k] = (diagonal[k + 1] - self._diagonal[k]) / (x_new - self.x[k])
+        self._diagonal = diagonal
+        self.x = np.append(self.x, float(x_new))
+        self.coef = np.append(self.coef, diagonal[0])
+
+    def __call__(self, x_point):
+        return newton_polynomial(self.x, self.coef, np.asarray(x_point, dtype=float))
 
 # Функция для генерации узлов Чебышева
 def chebyshev_nodes(n, a, b):
     return 0.5*(a+b) + 0.5*(b-a)*np.cos((2*np.arange(1, n+1)-1)/(2*n)*np.pi)
 
-# Генерация узлов Чебышева для интервала [0, 3]
-n = len(x_values)  # количество узлов
-a, b = x_values[0], x_values[-1]  # начало и конец интервала
-chebyshev_x_values = chebyshev_nodes(n, a, b)
-
-# Значения функции f в узлах Чебышева, интерполяция через исходные значения f_values
-chebyshev_f_values = np.interp(chebyshev_x_values, x_values, f_values)
-
-# Расчет разделенных разностей для узлов Чебышева
-chebyshev_coefs = divided_differences(chebyshev_x_values, chebyshev_f_values)
-
-# Вычисление значений полиномов на более плотной сетке
-x_dense = np.linspace(min(x_values), max(x_values), 100)
-newton_y_dense = [newton_polynomial(x_values, coef[0, :], x_point) for x_point in x_dense]
-chebyshev_y_dense = [newton_polynomial(chebyshev_x_values, chebyshev_coefs[0, :], x_point) for x_point in x_dense]
-
-# Вычисление интерполяционного полинома Ньютона для равноотстоящих узлов в точке x* = 1.5
-N3_uneven = newton_polynomial(x_values, coef[0, :], 1.5)
-
-# Вычисление интерполяционного полинома Ньютона для узлов Чебышева в точке x* = 1.5
-N3_chebyshev = newton_polynomial(chebyshev_x_values, chebyshev_coefs[0, :], 1.5)
-
-# Выведем значения полиномов и коэффициентов
-print("Значение интерполяционного полинома Ньютона для равноотстоящих узлов в точке x* = 1.5:", N3_uneven)
-print("Значение интерполяционного полинома Ньютона для узлов Чебышева в точке x* = 1.5:", N3_chebyshev)
-print("Коэффициенты интерполяционного полинома Ньютона для равноотстоящих узлов:", coef[0, :])
-print("Коэффициенты интерполяционного полинома Ньютона для узлов Чебышева:", chebyshev_coefs[0, :])
-
-# Визуализация результатов
-plt.figure(figsize=(14, 7))
-
-# Полином для равноотстоящих узлов
-plt.subplot(1, 2, 1)
-plt.plot(x_dense, newton_y_dense, label='Newton Polynomial - Evenly Spaced Nodes')
-plt.plot(x_values, f_values, 'ro', label='Data Points - Evenly Spaced Nodes')
-plt.title('Newton Polynomial - Evenly Spaced Nodes')
-plt.xlabel('x')
-plt.ylabel('f(x)')
-plt.legend()
-
-# Полином для узлов Чебышева
-plt.subplot(1, 2, 2)
-plt.plot(x_dense, chebyshev_y_dense, label='Newton Polynomial - Chebyshev Nodes')
-plt.plot(chebyshev_x_values, chebyshev_f_values, 'bo', label='Data Points - Chebyshev Nodes')
-plt.title('Newton Polynomial - Chebyshev Nodes')
-plt.xlabel('x')
-plt.legend()
-
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+def _sample(f, x):
+    # f может быть векторизованной (numpy) или принимать только числа (math)
+    try:
+        values = np.asarray(f(x), dtype=float)
+    except TypeError:
+        values = np.array([f(t) for t in x], dtype=float)
+    return np.broadcast_to(values, x.shape)
+
+def chebyshev_coefficients(values):
+    """
+    Коэффициенты c_j разложения f = sum c_j T_j по значениям в узлах chebyshev_nodes
+    (в том же порядке). Дискретное косинус-преобразование (DCT-II) через одно
+    БПФ длины n (алгоритм Махула), O(n log n).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    # Перестановка: четные отсчеты по возрастанию, нечетные по убыванию
+    v = np.concatenate([values[::2], values[1::2][::-1]])
+    V = np.fft.fft(v)
+    coef = np.real(np.exp(-0.5j * np.pi * np.arange(n) / n) * V) * (2 / n)
+    coef[0] /= 2
+    return coef
+
+class ChebyshevApproximation:
+    """
+    Приближение функции на [a, b] рядом по многочленам Чебышева f(x) ~ sum c_j T_j(t),
+    t = (2x - a - b) / (b - a).
+
+    f вычисляется только при построении - в узлах chebyshev_nodes, коэффициенты
+    получаются БПФ. Без degree число узлов удваивается (17, 33, 65, ...), пока
+    последние коэффициенты не станут меньше tol * max|c_j|; затем хвост малых
+    коэффициентов отбрасывается. Значения считаются рекуррентной схемой Кленшоу
+    сразу для массива точек.
+
+    Атрибуты: coef - коэффициенты c_j, n_evaluations - количество вычислений f,
+    converged - достигнута ли точность tol до max_degree.
+    """
+
+    def __init__(self, f, a=-1.0, b=1.0, degree=None, tol=1e-14, max_degree=2 ** 16):
+        self.a, self.b = float(a), float(b)
+        if not self.a < self.b:
+            raise ValueError("Нужно a < b")
+        self.n_evaluations = 0
+        if degree is not None:
+            self.coef = self._fit(f, degree + 1)
+            self.converged = True
+            return
+        n = 17
+        while True:
+            coef = self._fit(f, n)
+            scale = np.max(np.abs(coef))
+            if np.max(np.abs(coef[-3:])) <= tol * scale or n > max_degree:
+                break
+            n = 2 * n - 1
+        # Отбрасываем хвост малых коэффициентов
+        large = np.flatnonzero(np.abs(coef) > tol * scale)
+        self.coef = coef[:large[-1] + 1] if large.size else coef[:1]
+        self.converged = n <= max_degree
+
+    def _fit(self, f, n):
+        x = chebyshev_nodes(n, self.a, self.b)
+        self.n_evaluations += n
+        return chebyshev_coefficients(_sample(f, x))
+
+    @classmethod
+    def from_coefficients(cls, coef, a=-1.0, b=1.0):
+        approximation = cls.__new__(cls)
+        approximation.a, approximation.b = float(a), float(b)
+        approximation.coef = np.array(coef, dtype=float)
+        approximation.n_evaluations = 0
+        approximation.converged = True
+        return approximation
+
+    @property
+    def degree(self):
+        return len(self.coef) - 1
+
+    def _to_unit(self, x):
+        return (2 * x - self.a - self.b) / (self.b - self.a)
+
+    def __call__(self, x, chunk_size=2 ** 15):
+        """
+        Значения в точке или массиве точек x. Точки обрабатываются блоками по chunk_size,
+        рабочие массивы блока остаются в кэше процессора и обновляются на месте.
+        """
+        points = np.asarray(x, dtype=float)
+        flat = points.ravel()
+        result = np.empty(flat.size)
+        for start in range(0, flat.size, chunk_size):
+            t = self._to_unit(flat[start:start + chunk_size])
+            two_t = 2 * t
+            # Схема Кленшоу: b_k = c_k + 2 t b_{k+1} - b_{k+2}, f = c_0 + t b_1 - b_2
+            b1, b2, b = np.zeros_like(t), np.zeros_like(t), np.empty_like(t)
+            for c in self.coef[:0:-1]:
+                np.multiply(two_t, b1, out=b)
+                b += c
+                b -= b2
+                b1, b2, b = b, b1, b2
+            np.multiply(t, b1, out=b)
+            b += self.coef[0]
+            b -= b2
+            result[start:start + chunk_size] = b
+        if points.ndim == 0:
+            return float(result[0])
+        return result.reshape(points.shape)
+
+    def derivative(self):
+        """Приближение производной (коэффициенты по рекуррентной формуле, без вычислений f)."""
+        n = len(self.coef) - 1
+        d = np.zeros(max(n, 1))
+        # d_{k-1} = d_{k+1} + 2 k c_k
+        for k in range(n, 0, -1):
+            d[k - 1] = (d[k + 1] if k + 1 < n else 0.0) + 2 * k * self.coef[k]
+        d[0] /= 2
+        return ChebyshevApproximation.from_coefficients(d * 2 / (self.b - self.a), self.a, self.b)
+
+    def antiderivative(self):
+        """Приближение первообразной F с F(a) = 0."""
+        c = np.concatenate([self.coef, [0.0, 0.0]])
+        n = len(self.coef)
+        C = np.zeros(n + 1)
+        k = np.arange(1, n + 1)
+        C[1:] = (c[k - 1] - c[k + 1]) / (2 * k)
+        C[1] = c[0] - c[2] / 2
+        # T_k(-1) = (-1)^k
+        C[0] = -np.sum(C[1:] * (-1.0) ** k)
+        return ChebyshevApproximation.from_coefficients(C * (self.b - self.a) / 2, self.a, self.b)
+
+    def integral(self):
+        """Определенный интеграл по [a, b]."""
+        return self.antiderivative()(self.b)
+
+    def roots(self, tol=1e-8, max_colleague_degree=64):
+        """
+        Вещественные корни на [a, b]: собственные значения матрицы-компаньона для ряда
+        Чебышева (colleague matrix). Приближения высокой степени сначала делятся
+        пополам, чтобы матрицы оставались маленькими.
+        """
+        coef = self.coef
+        nonzero = np.flatnonzero(np.abs(coef) > 1e-15 * np.max(np.abs(coef), initial=0))
+        if nonzero.size == 0 or nonzero[-1] == 0:
+            return np.array([])
+        coef = coef[:nonzero[-1] + 1]
+        n = len(coef) - 1
+
+        if n > max_colleague_degree:
+            # Точка деления чуть смещена от середины, чтобы не попасть в симметричный корень
+            middle = self.a + 0.5001 * (self.b - self.a)
+            halves = [ChebyshevApproximation(self, self.a, middle), ChebyshevApproximation(self, middle, self.b)]
+            roots = np.concatenate([h.roots(tol, max_colleague_degree) for h in halves])
+            return np.unique(roots) if roots.size else roots
+
+        if n == 1:
+            t = np.array([-coef[0] / coef[1]])
+        else:
+            colleague = np.zeros((n, n))
+            colleague[0, 1] = 1.0
+            i = np.arange(1, n - 1)
+            colleague[i, i - 1] = colleague[i, i + 1] = 0.5
+            colleague[n - 1, n - 2] = 0.5
+            colleague[n - 1, :] -= coef[:n] / (2 * coef[n])
+            t = np.linalg.eigvals(colleague)
+            t = t[np.abs(t.imag) <= tol].real
+        t = np.sort(t[np.abs(t) <= 1 + tol])
+        return self.a + (np.clip(t, -1, 1) + 1) * (self.b - self.a) / 2
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt  # нужен только для графиков
+
+    # Исходные данные
+    x_values = np.array([0, 1, 2, 3])
+    f_values = np.array([1, 2, 4, 1])
+
+    # Расчет разделенных разностей для исходного набора значений
+    coef = newton_coefficients(x_values, f_values)
+
+    # Генерация узлов Чебышева для интервала [0, 3]
+    n = len(x_values)  # количество узлов
+    a, b = x_values[0], x_values[-1]  # начало и конец интервала
+    chebyshev_x_values = chebyshev_nodes(n, a, b)
+
+    # Значения функции f в узлах Чебышева, интерполяция через исходные значения f_values
+    chebyshev_f_values = np.interp(chebyshev_x_values, x_values, f_values)
+
+    # Расчет разделенных разностей для узлов Чебышева
+    chebyshev_coefs = newton_coefficients(chebyshev_x_values, chebyshev_f_values)
+
+    # Вычисление значений полиномов на более плотной сетке
+    x_dense = np.linspace(min(x_values), max(x_values), 100)
+    newton_y_dense = newton_polynomial(x_values, coef, x_dense)
+    chebyshev_y_dense = newton_polynomial(chebyshev_x_values, chebyshev_coefs, x_dense)
+
+    # Вычисление интерполяционного полинома Ньютона для равноотстоящих узлов в точке x* = 1.5
+    N3_uneven = newton_polynomial(x_values, coef, 1.5)
+
+    # Вычисление интерполяционного полинома Ньютона для узлов Чебышева в точке x* = 1.5
+    N3_chebyshev = newton_polynomial(chebyshev_x_values, chebyshev_coefs, 1.5)
+
+    # Выведем значения полиномов и коэффициентов
+    print("Значение интерполяционного полинома Ньютона для равноотстоящих узлов в точке x* = 1.5:", N3_uneven)
+    print("Значение интерполяционного полинома Ньютона для узлов Чебышева в точке x* = 1.5:", N3_chebyshev)
+    print("Коэффициенты интерполяционного полинома Ньютона для равноотстоящих узлов:", coef)
+    print("Коэффициенты интерполяционного полинома Ньютона для узлов Чебышева:", chebyshev_coefs)
+
+    # Приближение рядом Чебышева: функция вычисляется только при построении
+    approximation = ChebyshevApproximation(lambda t: np.exp(t) * np.sin(5 * t), a, b)
+    print("Степень ряда Чебышева для exp(x) sin(5x) на [0, 3]:", approximation.degree)
+    print("Значение в x* = 1.5:", approximation(1.5), "точное:", np.exp(1.5) * np.sin(7.5))
+    print("Корни:", approximation.roots())
+    print("Интеграл по [0, 3]:", approximation.integral())
+
+    # Визуализация результатов
+    plt.figure(figsize=(14, 7))
+
+    # Полином для равноотстоящих узлов
+    plt.subplot(1, 2, 1)
+    plt.plot(x_dense, newton_y_dense, label='Newton Polynomial - Evenly Spaced Nodes')
+    plt.plot(x_values, f_values, 'ro', label='Data Points - Evenly Spaced Nodes')
+    plt.title('Newton Polynomial - Evenly Spaced Nodes')
+    plt.xlabel('x')
+    plt.ylabel('f(x)')
+    plt.legend()
+
+    # Полином для узлов Чебышева
+    plt.subplot(1, 2, 2)
+    plt.plot(x_dense, chebyshev_y_dense, label='Newton Polynomial - Chebyshev Nodes')
+    plt.plot(chebyshev_x_values, chebyshev_f_values, 'bo', label='Data Points - Chebyshev Nodes')
+    plt.title('Newton Polynomial - Chebyshev Nodes')
+    plt.xlabel('x')
+    plt.legend()
+
+    plt.tight_layout()
+    plt.show()
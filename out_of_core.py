@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+
+# Сколько элементов float64 обрабатывать за один блок (32 МБ)
+BLOCK_ELEMENTS = 2 ** 22
+
+
+def load_array(source, writable=False):
+    """
+    Возвращает массив без копирования данных, если это возможно.
+
+    Параметры:
+    - source: путь к файлу .npy (открывается через np.memmap), np.memmap,
+      np.ndarray или любой объект, приводимый к массиву
+    - writable: открыть файл .npy на запись (mmap_mode='r+')
+
+    Возвращает:
+    - numpy.ndarray или numpy.memmap
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return np.load(source, mmap_mode='r+' if writable else 'r')
+    if isinstance(source, np.ndarray):
+        return source
+    return np.asarray(source, dtype=float)
+
+
+def rows_per_block(n_columns, block_elements=BLOCK_ELEMENTS):
+    """Количество строк блока, чтобы в памяти было не больше block_elements элементов."""
+    return max(1, block_elements // max(n_columns, 1))
+
+
+def working_copy(A, overwrite=False, out=None):
+    """
+    Рабочий массив float64, который можно изменять на месте.
+
+    - overwrite=True: сам A (должен быть записываемым массивом float64, например
+      np.memmap с mode='r+'), без копии;
+    - out: путь к файлу .npy, куда A копируется блоками строк - копия живет на диске;
+    - иначе обычная копия в памяти.
+    """
+    A = load_array(A, writable=overwrite)
+    if overwrite:
+        if A.dtype != np.float64 or not A.flags.writeable:
+            raise ValueError("Для работы на месте нужен записываемый массив float64")
+        return A
+    if out is None:
+        return np.array(A, dtype=float)
+    copy = np.lib.format.open_memmap(out, mode='w+', dtype=np.float64, shape=A.shape)
+    step = rows_per_block(A.shape[1] if A.ndim > 1 else 1)
+    for start in range(0, A.shape[0], step):
+        copy[start:start + step] = A[start:start + step]
+    return copy
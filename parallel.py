@@ -0,0 +1,47 @@
+import concurrent.futures
+import os
+
+import numpy as np
+
+# thread - для функций, отпускающих GIL (NumPy/BLAS),
+# process - для функций на чистом Python (аргументы и функция должны сериализоваться pickle).
+# Классы берутся по имени при запуске: concurrent.futures загружает multiprocessing лениво
+BACKENDS = {'thread': 'ThreadPoolExecutor', 'process': 'ProcessPoolExecutor'}
+
+
+def resolve_workers(workers):
+    """None или число <= 0 означает все ядра машины."""
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def spawn_seeds(seed, n):
+    """
+    Независимые зерна для n задач. Зерно задачи зависит только от seed и ее номера,
+    поэтому результат не зависит от количества процессов и порядка выполнения.
+    """
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n)]
+
+
+def parallel_map(func, tasks, workers=1, backend='thread'):
+    """
+    Применяет func к каждой задаче из tasks, возвращая результаты в порядке задач.
+
+    Параметры:
+    - func: функция одного аргумента
+    - tasks: последовательность аргументов
+    - workers: количество потоков/процессов (1 - последовательно, None - все ядра)
+    - backend: 'thread' или 'process'
+
+    Возвращает:
+    - list: результаты в том же порядке, что и tasks
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Неизвестный backend: {backend}, допустимые: {tuple(BACKENDS)}")
+    tasks = list(tasks)
+    workers = min(resolve_workers(workers), max(len(tasks), 1))
+    if workers == 1:
+        return [func(task) for task in tasks]
+    with getattr(concurrent.futures, BACKENDS[backend])(max_workers=workers) as pool:
+        return list(pool.map(func, tasks))
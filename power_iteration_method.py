@@ -1,40 +1,270 @@
+import time
+
 import numpy as np
 
-def power_iteration(A, num_iterations=100, tol=1e-6):
+from gaus_simple_iteration import lu_factor
+from out_of_core import load_array, working_copy
+from solver_result import STATUS_CONVERGED, STATUS_MAX_ITERATIONS, SolverResult, make_observer
+
+
+def _as_operator(A, n=None, sigma=None):
+    """
+    Возвращает (op, n), где op(X) = A X для вектора или блока векторов.
+    A может быть плотной матрицей (в том числе np.memmap или путем к файлу .npy -
+    данные читаются с диска без копирования), разреженной матрицей scipy.sparse
+    или функцией v -> Av (тогда нужно передать n). При заданном sigma op(X) = (A - sigma I)^-1 X
+    (сдвиг с обращением): A - sigma I раскладывается один раз (lu_factor), op решает системы.
+    """
+    if callable(A) and not hasattr(A, 'shape'):
+        if n is None:
+            raise ValueError("Для A в виде функции нужно указать размерность n")
+        if sigma is not None:
+            raise ValueError("Сдвиг с обращением требует матрицу, а не функцию")
+
+        def op(X):
+            if X.ndim == 1:
+                return A(X)
+            return np.column_stack([A(x) for x in X.T])
+        return op, n
+
+    if not hasattr(A, 'tocsc'):
+        A = load_array(A)
+    n = A.shape[0]
+    if sigma is None:
+        return (lambda X: A @ X), n
+    if hasattr(A, 'tocsc'):
+        from scipy.sparse import identity
+        from scipy.sparse.linalg import splu
+        return splu((A - sigma * identity(n, format='csc')).tocsc()).solve, n
+    # Единственная копия A - она же после сдвига хранит LU-разложение
+    shifted = working_copy(A)
+    shifted[np.diag_indices(n)] -= sigma
+    return lu_factor(shifted, overwrite_a=True).solve, n
+
+
+def _deflation(deflate):
+    """
+    Проектор, убирающий из векторов компоненты вдоль уже известных
+    (ортонормированных) собственных векторов deflate.
+    """
+    if deflate is None:
+        return lambda X: X
+    W = np.asarray(deflate, float)
+    W = W.reshape(len(W), -1)
+    return lambda X: X - W @ (W.T @ X)
+
+
+def power_iteration(A, num_iterations=100, tol=1e-6, seed=None, n=None, callback=None, return_result=False):
     """
     Выполняет метод степенной итерации для матрицы A.
     
     Параметры:
-    - A: матрица n x n
+    - A: матрица n x n (плотная или scipy.sparse) или функция v -> Av
     - num_iterations: максимальное количество итераций
     - tol: критерий остановки
+    - seed: зерно генератора начального вектора
+    - n: размерность, если A задана функцией
+    - callback: функция (итерация, вектор, ||b_next - b_k||), вызывается на каждой итерации
+    - return_result: вернуть SolverResult со значением (lambda_1, b_k) и историей ||b_next - b_k||
     
     Возвращает:
     - lambda_1: доминирующее собственное значение
     - b_k: соответствующий собственный вектор
     """
-    
-    n = A.shape[0]
-    b_k = np.random.rand(n)  # Инициализируем случайный вектор
+    start = time.perf_counter()
+    history = [] if return_result else None
+    observe = make_observer(callback, history)
+    status = STATUS_MAX_ITERATIONS
+    iteration = 0
+
+    op, n = _as_operator(A, n)
+    b_k = np.random.default_rng(seed).random(n)  # Инициализируем случайный вектор
     b_k = b_k / np.linalg.norm(b_k)
     
-    for _ in range(num_iterations):
+    for iteration in range(1, num_iterations + 1):
         # Умножаем вектор на матрицу
-        w = np.dot(A, b_k)
+        w = op(b_k)
         # Нормализация вектора
         b_next = w / np.linalg.norm(w)
         
         # Проверка на сходимость
-        if np.linalg.norm(b_next - b_k) < tol:
+        step = np.linalg.norm(b_next - b_k)
+        if observe:
+            observe(iteration, b_next, step)
+        if step < tol:
+            status = STATUS_CONVERGED
             break
         
         b_k = b_next
     
     # Вычисляем соответствующее собственное значение
-    lambda_1 = np.dot(b_k.T, np.dot(A, b_k))
+    lambda_1 = np.dot(b_k.T, op(b_k))
     
+    if return_result:
+        return SolverResult((lambda_1, b_k), iteration, iteration + 1, history, start, status)
     return lambda_1, b_k
 
+
+def subspace_iteration(A, k, num_iterations=300, tol=1e-8, seed=None, n=None, sigma=None, deflate=None, symmetric=True,
+                       oversampling=None, callback=None, return_result=False):
+    """
+    Блочный степенной метод (итерация подпространств) с процедурой Рэлея-Ритца:
+    находит k собственных пар с наибольшими по модулю собственными значениями.
+
+    Параметры:
+    - A: матрица n x n (плотная или scipy.sparse) или функция v -> Av
+    - k: количество собственных пар
+    - num_iterations: максимальное количество итераций
+    - tol: допустимая относительная невязка ||Ay - theta y|| / |theta|
+    - seed: зерно генератора начального блока
+    - n: размерность, если A задана функцией
+    - sigma: сдвиг - ищутся собственные значения, ближайшие к sigma
+    - deflate: матрица n x m уже найденных ортонормированных собственных векторов,
+      их направления исключаются из поиска
+    - symmetric: матрица симметрична (иначе используются комплексные пары Ритца)
+    - oversampling: количество дополнительных векторов блока (по умолчанию max(k, 10)).
+      Итерируется блок из k + oversampling векторов, сходимость проверяется по первым k:
+      скорость сходимости k-й пары определяется отношением |lambda_{k+p+1} / lambda_k|,
+      а не медленным |lambda_{k+1} / lambda_k|
+    - callback: функция (итерация, собственные значения, max относительной невязки)
+    - return_result: вернуть SolverResult со значением (eigenvalues, eigenvectors),
+      историей максимальной относительной невязки и статусом STATUS_MAX_ITERATIONS,
+      если точность tol не достигнута; n_evaluations - количество применений A к вектору
+      (k + oversampling за итерацию)
+
+    Возвращает:
+    - eigenvalues: k собственных значений
+    - eigenvectors: матрица n x k собственных векторов по столбцам
+    """
+    start = time.perf_counter()
+    history = [] if return_result else None
+    observe = make_observer(callback, history)
+    status = STATUS_MAX_ITERATIONS
+    iteration = 0
+
+    op, n = _as_operator(A, n, sigma)
+    project = _deflation(deflate)
+    if oversampling is None:
+        oversampling = max(k, 10)
+    # Блок не шире пространства, оставшегося после исключения deflate
+    n_free = n if deflate is None else n - np.asarray(deflate).reshape(n, -1).shape[1]
+    m = max(k, min(n_free, k + oversampling))
+    Q, _ = np.linalg.qr(project(np.random.default_rng(seed).standard_normal((n, m))))
+
+    for iteration in range(1, num_iterations + 1):
+        Z = project(op(Q))
+        H = Q.T @ Z
+        theta, S = np.linalg.eigh((H + H.T) / 2) if symmetric else np.linalg.eig(H)
+        order = np.argsort(-np.abs(theta))
+        theta, S = theta[order], S[:, order]
+        Y = Q @ S
+        ZS = Z @ S
+        residuals = np.linalg.norm(ZS[:, :k] - Y[:, :k] * theta[:k], axis=0)
+        if observe:
+            observe(iteration, theta[:k], np.max(residuals / np.abs(theta[:k])))
+        if np.all(residuals <= tol * np.abs(theta[:k])):
+            status = STATUS_CONVERGED
+            break
+        Q, _ = np.linalg.qr(ZS)
+
+    theta, Y = theta[:k], Y[:, :k]
+    if sigma is not None:
+        theta = sigma + 1 / theta
+    if return_result:
+        return SolverResult((theta, Y), iteration, iteration * m, history, start, status)
+    return theta, Y
+
+
+def lanczos(A, k, max_basis=None, tol=1e-8, seed=None, n=None, sigma=None, deflate=None, max_restarts=100,
+            callback=None, return_result=False):
+    """
+    Метод Ланцоша с полной реортогонализацией и "толстым" перезапуском для симметричной
+    матрицы: находит k собственных пар с наибольшими по модулю собственными значениями
+    (при заданном sigma - ближайшими к sigma).
+
+    Базис Крылова хранит не больше max_basis векторов длины n (по умолчанию
+    min(n, max(4 k, 60))). Когда базис заполнен, в нем остаются лучшие пары Ритца
+    и построение продолжается от последнего вектора.
+    Остальные параметры как у subspace_iteration; итерация для callback и истории -
+    цикл построения базиса между перезапусками.
+    """
+    start_time = time.perf_counter()
+    history = [] if return_result else None
+    observe = make_observer(callback, history)
+    status = STATUS_MAX_ITERATIONS
+    n_evaluations = 0
+
+    op, n = _as_operator(A, n, sigma)
+    project = _deflation(deflate)
+    if max_basis is None:
+        max_basis = min(n, max(4 * k, 60))
+    keep = min(max_basis - 1, k + (max_basis - k) // 2)
+
+    V = np.zeros((max_basis + 1, n))
+    # H[:m, :m] = V^T A V - проекция A на базис (трехдиагональная до первого перезапуска)
+    H = np.zeros((max_basis + 1, max_basis))
+    v = project(np.random.default_rng(seed).standard_normal(n))
+    V[0] = v / np.linalg.norm(v)
+    start = 0
+
+    for cycle in range(1, max_restarts + 2):
+        for j in range(start, max_basis):
+            w = project(op(V[j]))
+            n_evaluations += 1
+            # Грам-Шмидт против всего базиса, дважды
+            for _ in range(2):
+                h = V[:j + 1] @ w
+                w -= V[:j + 1].T @ h
+                H[:j + 1, j] += h
+            H[j + 1, j] = np.linalg.norm(w)
+
+            m = j + 1
+            if H[j + 1, j] == 0:
+                break
+            V[m] = w / H[j + 1, j]
+            if m >= k and m % 10 == 0:
+                theta, S = _ritz(H, m)
+                if np.all(H[m, m - 1] * np.abs(S[-1, :k]) <= tol * np.abs(theta[:k])):
+                    break
+
+        theta, S = _ritz(H, m)
+        # Невязка пары Ритца: H[m, m-1] * |последняя компонента собственного вектора|
+        residuals = H[m, m - 1] * np.abs(S[-1, :k])
+        if observe:
+            observe(cycle, theta[:k], np.max(residuals / np.abs(theta[:k])))
+        if H[m, m - 1] == 0 or np.all(residuals <= tol * np.abs(theta[:k])):
+            status = STATUS_CONVERGED
+            break
+        if m < max_basis:
+            break
+
+        # Толстый перезапуск: оставить keep лучших векторов Ритца
+        Y = V[:m].T @ S[:, :keep]
+        coupling = H[m, m - 1] * S[-1, :keep]
+        V[keep] = V[m]
+        V[:keep] = Y.T
+        H[:] = 0
+        H[np.arange(keep), np.arange(keep)] = theta[:keep]
+        H[keep, :keep] = coupling
+        start = keep
+
+    eigenvalues = theta[:k]
+    eigenvectors = V[:m].T @ S[:, :k]
+    if sigma is not None:
+        eigenvalues = sigma + 1 / eigenvalues
+    if return_result:
+        return SolverResult((eigenvalues, eigenvectors), cycle, n_evaluations, history, start_time, status)
+    return eigenvalues, eigenvectors
+
+
+def _ritz(H, m):
+    """Пары Ритца проекции H[:m, :m], упорядоченные по убыванию модуля."""
+    T = H[:m, :m]
+    theta, S = np.linalg.eigh((T + T.T) / 2)
+    order = np.argsort(-np.abs(theta))
+    return theta[order], S[:, order]
+
+
 # Тестирование
 def test():
     A = np.array([[4, 2], [2, 3]])
@@ -48,4 +278,12 @@ def test():
     print("Ожидаемое собственное значение:", eigenvalues[max_index])
     print("Ожидаемый собственный вектор:", eigenvectors[:, max_index])
 
-test()
+    # Несколько собственных пар
+    B = np.array([[4, 1, 0, 0], [1, 3, 1, 0], [0, 1, 2, 1], [0, 0, 1, 1]], dtype=float)
+    print("Две наибольшие (итерация подпространств):", subspace_iteration(B, 2, seed=0)[0])
+    print("Две наибольшие (Ланцош):", lanczos(B, 2, seed=0)[0])
+    print("Ближайшее к 2.5 (сдвиг с обращением):", lanczos(B, 1, sigma=2.5, seed=0)[0])
+    print("Ожидаемые:", np.linalg.eigvalsh(B))
+
+if __name__ == "__main__":
+    test()
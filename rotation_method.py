@@ -1,53 +1,258 @@
+import time
+
 import numpy as np
 
-def jacobi_rotation(A, tol=1e-10, max_iterations=1000):
-    def max_off_diagonal_element(matrix):
-        """Найти максимальный элемент матрицы вне диагонали."""
-        # Исключаем диагональ, заполнив ее нулями
-        modified_matrix = matrix.copy()
-        np.fill_diagonal(modified_matrix, 0)
-        
-        i, j = np.unravel_index(np.argmax(np.abs(modified_matrix)), matrix.shape)
-        return i, j, modified_matrix[i, j]
-
-    def compute_phi(matrix, i, j):
-        """Вычислить угол поворота фи."""
-        if matrix[i, i] == matrix[j, j]:
-            phi = np.pi / 4
-        else:
-            phi = 0.5 * np.arctan(2 * matrix[i, j] / (matrix[i, i] - matrix[j, j]))
-        return phi
-    
-    def jacobi_matrix(matrix, i, j, phi):
-        """Построить матрицу поворота Якоби."""
-        J = np.eye(matrix.shape[0])
-        J[i, i] = J[j, j] = np.cos(phi)
-        J[i, j] = -np.sin(phi)
-        J[j, i] = np.sin(phi)
-        return J
+from cache import array_digest
+from out_of_core import load_array, rows_per_block, working_copy
+from solver_result import STATUS_CONVERGED, STATUS_MAX_ITERATIONS, SolverResult, make_observer
+
+
+def compute_phi(matrix, i, j):
+    """Вычислить угол поворота фи."""
+    if matrix[i, i] == matrix[j, j]:
+        phi = np.pi / 4
+    else:
+        phi = 0.5 * np.arctan(2 * matrix[i, j] / (matrix[i, i] - matrix[j, j]))
+    return phi
+
+
+def rotate(A, i, j, phi, V=None):
+    """
+    Применить поворот Якоби A <- J^T A J на месте, изменяя только строки и столбцы i, j (O(n)).
+    Новые строки i, j считаются по старым строкам, столбцы копируются из строк по симметрии.
+    Если передана V, накапливает собственные векторы: V <- V J.
+    """
+    c, s = np.cos(phi), np.sin(phi)
+    a_ii, a_jj, a_ij = A[i, i], A[j, j], A[i, j]
+    row_i, row_j = A[i].copy(), A[j].copy()
+    A[i] = c * row_i + s * row_j
+    A[j] = -s * row_i + c * row_j
+    A[i, i] = c * c * a_ii + 2 * c * s * a_ij + s * s * a_jj
+    A[j, j] = s * s * a_ii - 2 * c * s * a_ij + c * c * a_jj
+    A[i, j] = A[j, i] = 0.0
+    A[:, i] = A[i]
+    A[:, j] = A[j]
+    if V is not None:
+        col_i, col_j = V[:, i].copy(), V[:, j].copy()
+        V[:, i] = c * col_i + s * col_j
+        V[:, j] = -s * col_i + c * col_j
+
+
+def round_robin_pairs(n):
+    """
+    Круговая схема турнира: n - 1 раундов (n для нечетного n), в каждом раунде
+    непересекающиеся пары (p, q), p < q, так что повороты раунда независимы.
+    """
+    players = list(range(n + n % 2))
+    m = len(players)
+    rounds = []
+    for _ in range(m - 1):
+        pairs = [(players[k], players[m - 1 - k]) for k in range(m // 2)]
+        pairs = [(min(p, q), max(p, q)) for p, q in pairs if max(p, q) < n]
+        rounds.append((np.array([p for p, _ in pairs], dtype=int), np.array([q for _, q in pairs], dtype=int)))
+        players = [players[0], players[-1]] + players[1:-1]
+    return rounds
+
+
+def _max_off_diagonal(A):
+    """Максимальный по модулю внедиагональный элемент; матрица просматривается блоками строк."""
+    n = A.shape[0]
+    largest = 0.0
+    step = rows_per_block(n)
+    for start in range(0, n, step):
+        block = np.abs(A[start:start + step])
+        rows = np.arange(len(block))
+        block[rows, start + rows] = 0
+        largest = max(largest, block.max())
+    return largest
+
+
+def jacobi_rotation(A, tol=1e-10, max_iterations=1000, ordering='max', max_sweeps=50, return_eigenvectors=False,
+                    overwrite_a=False, out=None, callback=None, return_result=False, cache=None):
+    """
+    Метод вращений Якоби для симметричной матрицы. Повороты применяются на месте
+    к строкам и столбцам i, j, без построения матрицы поворота.
+
+    Параметры:
+    - A: симметричная матрица n x n
+    - tol: порог для внедиагональных элементов
+    - max_iterations: максимальное количество поворотов (ordering='max')
+    - ordering: 'max' - классический выбор максимального элемента (индекс максимума
+      в каждой строке поддерживается при поворотах, полный поиск не нужен);
+      'cyclic' - циклические проходы по парам с пропуском элементов меньше tol;
+      'parallel' - круговая схема, независимые повороты раунда выполняются одновременно
+      (меньше накладных расходов Python на малых матрицах; при n около 500 и больше
+      не быстрее 'cyclic', так как каждый раунд проходит по строкам и столбцам всех пар)
+    - max_sweeps: максимальное количество проходов для 'cyclic' и 'parallel'
+    - return_eigenvectors: вернуть также накопленные собственные векторы
+    - overwrite_a: вращать саму A на месте (например, np.memmap с mode='r+'), без копии
+    - out: путь к файлу .npy для рабочей копии A вместо копии в памяти.
+      Порядки 'max' и 'cyclic' затрагивают только строки и столбцы i, j;
+      'parallel' обращается к столбцам блоками и требует размещения матрицы в памяти
+      (и рабочих буферов еще на n^2 / 2 чисел каждый, всего четыре)
+    - callback: функция (итерация, A, максимальный внедиагональный элемент); итерация -
+      поворот для 'max' и проход для 'cyclic' и 'parallel'
+    - return_result: вернуть SolverResult, value - обычный результат метода,
+      history - максимальный внедиагональный элемент по итерациям
+    - cache: ArrayCache; результат для той же матрицы и параметров берется из кэша
+      (массивы только для чтения). При callback или return_result кэш не используется
+
+    Возвращает:
+    - eigenvalues: собственные значения (диагональ)
+    - A: преобразованная матрица
+    - V: собственные векторы по столбцам (если return_eigenvectors=True)
+    """
+    if cache is not None and callback is None and not return_result:
+        key = array_digest(load_array(A), function='jacobi_rotation', tol=tol, max_iterations=max_iterations,
+                           ordering=ordering, max_sweeps=max_sweeps, return_eigenvectors=return_eigenvectors)
 
+        def compute():
+            value = jacobi_rotation(A, tol, max_iterations, ordering, max_sweeps, return_eigenvectors, overwrite_a, out)
+            return dict(zip(('eigenvalues', 'A', 'V'), value))
+        arrays = cache.cached(key, compute)
+        return tuple(arrays[name] for name in ('eigenvalues', 'A', 'V') if name in arrays)
+
+    start = time.perf_counter()
+    history = [] if return_result else None
+    observe = make_observer(callback, history)
+    A = working_copy(A, overwrite_a, out)
     n = A.shape[0]
-    iter_count = 0
+    V = np.eye(n) if return_eigenvectors else None
+
+    if ordering == 'max':
+        iterations, converged = _jacobi_max(A, V, tol, max_iterations, observe)
+    elif ordering in ('cyclic', 'parallel'):
+        rounds = round_robin_pairs(n) if ordering == 'parallel' else None
+        work = _round_work(n) if ordering == 'parallel' else None
+        Vt = V.T.copy() if ordering == 'parallel' and return_eigenvectors else None
+        iterations, converged = 0, False
+        for _ in range(max_sweeps):
+            off_diagonal = _max_off_diagonal(A)
+            if observe:
+                observe(iterations, A, off_diagonal)
+            if off_diagonal < tol:
+                converged = True
+                break
+            iterations += 1
+            if rounds is None:
+                for i in range(n - 1):
+                    for j in range(i + 1, n):
+                        if abs(A[i, j]) >= tol:
+                            rotate(A, i, j, compute_phi(A, i, j), V)
+            else:
+                for P, Q in rounds:
+                    _rotate_round(A, P, Q, tol, Vt, work)
+        if Vt is not None:
+            V = Vt.T
+    else:
+        raise ValueError(f"Неизвестный порядок поворотов: {ordering}")
+
+    eigenvalues = np.diagonal(A).copy()
+    value = (eigenvalues, A, V) if return_eigenvectors else (eigenvalues, A)
+    if return_result:
+        status = STATUS_CONVERGED if converged else STATUS_MAX_ITERATIONS
+        return SolverResult(value, iterations, None, history, start, status)
+    return value
+
+
+def _jacobi_max(A, V, tol, max_iterations, observe=None):
+    """
+    Классический метод Якоби с поддержкой индекса максимума в каждой строке.
+    Возвращает (количество поворотов, достигнута ли точность tol).
+    """
+    n = A.shape[0]
+    if n < 2:
+        return 0, True
+    rows = np.arange(n - 1)
+
+    def row_argmax(k):
+        return k + 1 + np.argmax(np.abs(A[k, k + 1:]))
+
+    row_max = np.array([row_argmax(k) for k in rows])
+    for iteration in range(max_iterations):
+        values = np.abs(A[rows, row_max])
+        i = np.argmax(values)
+        if observe:
+            observe(iteration, A, values[i])
+        if values[i] < tol:
+            return iteration, True
+        j = row_max[i]
+        rotate(A, i, j, compute_phi(A, i, j), V)
+
+        # Изменились только строки и столбцы i, j
+        stale = (row_max == i) | (row_max == j)
+        stale[[k for k in (i, j) if k < n - 1]] = True
+        for k in np.flatnonzero(stale):
+            row_max[k] = row_argmax(k)
+        current = np.abs(A[rows, row_max])
+        for col in (i, j):
+            candidates = (rows < col) & ~stale
+            better = candidates & (np.abs(A[rows, col]) > current)
+            row_max[better] = col
+            current[better] = np.abs(A[rows[better], col])
+    return max_iterations, np.abs(A[rows, row_max]).max() < tol
+
+
+def _rotate_round(A, P, Q, tol, Vt=None, work=None):
+    """
+    Одновременно применить независимые повороты (P[k], Q[k]) одного раунда.
+    Пары с |A[p, q]| < tol пропускаются. Поворачиваются строки P, Q, затем
+    столбцы P, Q; остальная матрица не затрагивается.
+    Vt - транспонированная матрица собственных векторов,
+    work - рабочие буферы из _round_work (промежуточные массивы не создаются заново).
+    """
+    a = A[P, Q]
+    active = np.abs(a) >= tol
+    if not active.any():
+        return
+    P, Q, a = P[active], Q[active], a[active]
+    d = A[P, P] - A[Q, Q]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        phi = np.where(d == 0, np.pi / 4, 0.5 * np.arctan(2 * a / d))
+    c, s = np.cos(phi), np.sin(phi)
+    if work is None:
+        work = _round_work(A.shape[0])
+
+    _rotate_lines(A, P, Q, c[:, None], s[:, None], work, axis=0)
+    if Vt is not None:
+        _rotate_lines(Vt, P, Q, c[:, None], s[:, None], work, axis=0)
+    _rotate_lines(A, P, Q, c, s, work, axis=1)
+    A[P, Q] = A[Q, P] = 0.0
+
+
+def _round_work(n):
+    """Четыре буфера под строки (или столбцы) одной половины пар раунда."""
+    return [np.empty(n * ((n + 1) // 2)) for _ in range(4)]
 
-    while iter_count < max_iterations:
-        i, j, max_val = max_off_diagonal_element(A)
 
-        # Проверка сходимости
-        if abs(max_val) < tol:
-            break
+def _rotate_lines(M, P, Q, c, s, work, axis):
+    """Строки (axis=0) или столбцы (axis=1) P, Q <- (c P + s Q, c Q - s P) через буферы work."""
+    shape = (P.size, M.shape[1]) if axis == 0 else (M.shape[0], P.size)
+    line_p, line_q, scaled, new_p = (w[:shape[0] * shape[1]].reshape(shape) for w in work)
+    np.take(M, P, axis=axis, out=line_p)
+    np.take(M, Q, axis=axis, out=line_q)
+    np.multiply(line_q, s, out=scaled)
+    np.multiply(line_p, c, out=new_p)
+    new_p += scaled
+    line_q *= c
+    line_p *= s
+    line_q -= line_p
+    if axis == 0:
+        M[P] = new_p
+        M[Q] = line_q
+    else:
+        M[:, P] = new_p
+        M[:, Q] = line_q
 
-        phi = compute_phi(A, i, j)
-        J = jacobi_matrix(A, i, j, phi)
-        A = J.T @ A @ J
-        iter_count += 1
 
-    eigenvalues = np.diagonal(A)
-    return eigenvalues, A
+if __name__ == "__main__":
+    # Тестирование метода
+    A = np.array([[4, -2, 2],
+                  [-2, 2, -2],
+                  [2, -2, 3]])
 
-# Тестирование метода
-A = np.array([[4, -2, 2],
-              [-2, 2, -2],
-              [2, -2, 3]])
+    eigenvalues, A_prime = jacobi_rotation(A)
+    print(eigenvalues, A_prime)
 
-eigenvalues, A_prime = jacobi_rotation(A)
-print(eigenvalues, A_prime)
+    eigenvalues, A_prime, V = jacobi_rotation(A, ordering='parallel', return_eigenvectors=True)
+    print(eigenvalues, V)
@@ -1,15 +1,141 @@
-def sqrt_a(a, tol=1e-10, max_iter=1000):
-    xn = a / 2  # Начальное приближение
-    for _ in range(max_iter):
-        xn1 = 0.5 * (a / xn + xn)
-        if abs(xn1 - xn) < tol:
-            return xn1
-        xn = xn1
-    else:
-        print("MAX кол-во итераций превышено")
+import time
+
+import numpy as np
+
+from solver_result import STATUS_CONVERGED, STATUS_DIVERGED, STATUS_MAX_ITERATIONS, SolverResult, make_observer
+
+FIXED_POINT_METHODS = ('plain', 'steffensen', 'anderson')
+
+
+def fixed_point(g, x0, tol=1e-10, max_iterations=1000, method='plain', rtol=0.0, memory=10, callback=None,
+                return_result=False):
+    """
+    Метод простых итераций x_{k+1} = g(x_k) с ускорением сходимости.
+
+    Параметры:
+    - g: отображение; принимает и возвращает число или массив формы x0
+    - x0: начальное приближение (число или массив - тысячи значений итерируются одновременно)
+    - tol, rtol: критерий остановки |g(x) - x| <= tol + rtol * |g(x)| для всех компонент
+    - max_iterations: максимальное количество итераций
+    - method: 'plain' - обычные итерации;
+      'steffensen' - метод Стеффенсена: по x, g(x), g(g(x)) строится экстраполяция
+      Эйткена (дельта-квадрат) и итерации продолжаются от нее. Применяется покомпонентно,
+      поэтому подходит для массива независимых скалярных задач;
+      'anderson' - смешивание Андерсона для векторных задач: следующее приближение -
+      комбинация последних memory + 1 значений g, минимизирующая невязку g(x) - x
+      в смысле наименьших квадратов
+    - memory: глубина истории для 'anderson'
+    - callback: функция (итерация, x, max|g(x) - x|), вызывается на каждой итерации
+    - return_result: вернуть SolverResult с историей max|g(x) - x|; сообщение при неудаче не печатается
+
+    Возвращает:
+    - x: неподвижная точка (число для скалярного x0) или None, если итерации не сошлись
+    """
+    if method not in FIXED_POINT_METHODS:
+        raise ValueError(f"Неизвестный метод: {method}, ожидается один из {FIXED_POINT_METHODS}")
+    start = time.perf_counter()
+    history = [] if return_result else None
+    observe = make_observer(callback, history)
+    x = np.asarray(x0, dtype=float)
+    shape = x.shape
+    status, message = STATUS_MAX_ITERATIONS, "MAX кол-во итераций превышено"
+    n_evaluations = 0
+    iteration = 0
+    G, F = [], []  # история значений g и невязок для метода Андерсона
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for iteration in range(1, max_iterations + 1):
+            gx = np.asarray(g(x), dtype=float)
+            n_evaluations += 1
+            f = gx - x
+            residual = float(np.max(np.abs(f))) if f.size else 0.0
+            if observe:
+                observe(iteration, gx, residual)
+            if not np.all(np.isfinite(gx)):
+                status, message = STATUS_DIVERGED, f"Итерации расходятся на итерации {iteration}"
+                break
+            if np.all(np.abs(f) <= tol + rtol * np.abs(gx)):
+                x, status, message = gx, STATUS_CONVERGED, ''
+                break
+
+            if method == 'plain':
+                x = gx
+            elif method == 'steffensen':
+                ggx = np.asarray(g(gx), dtype=float)
+                n_evaluations += 1
+                denominator = ggx - 2 * gx + x
+                accelerated = x - f * f / denominator
+                x = np.where((denominator != 0) & np.isfinite(accelerated), accelerated, ggx)
+            else:
+                G.append(gx.ravel())
+                F.append(f.ravel())
+                if len(F) > memory + 1:
+                    del G[0], F[0]
+                x = gx
+                if len(F) > 1:
+                    dF = np.diff(np.array(F), axis=0)
+                    dG = np.diff(np.array(G), axis=0)
+                    gamma = np.linalg.lstsq(dF.T, F[-1], rcond=None)[0]
+                    x = (G[-1] - gamma @ dG).reshape(shape)
+
+    value = x if shape else float(x)
+    if return_result:
+        return SolverResult(value, iteration, n_evaluations, history, start, status, message)
+    if status != STATUS_CONVERGED:
+        print(message)
         return None
+    return value
+
+
+def sqrt_initial_guess(a):
+    """
+    Начальное приближение к sqrt(a) по разложению a = m * 2^e (np.frexp):
+    при четном e sqrt(a) = sqrt(m) * 2^(e/2), а sqrt(m) для m в [0.5, 2)
+    приближается прямой (1 + m) / 2 с ошибкой не больше 6%.
+    Метод Герона от такого приближения сходится за 4-5 итераций при любом порядке a.
+    """
+    m, e = np.frexp(np.asarray(a, dtype=float))
+    odd = (e % 2) != 0
+    m = np.where(odd, 2 * m, m)
+    e = np.where(odd, e - 1, e)
+    return np.ldexp(np.where(m == 0, 0.0, (1 + m) / 2), e // 2)
+
+
+def sqrt_a(a, tol=1e-10, max_iter=1000, callback=None, return_result=False):
+    # Метод Герона x = (x + a / x) / 2 как простая итерация; a может быть массивом.
+    # callback(итерация, x, |x_new - x|) вызывается на каждой итерации;
+    # при return_result=True возвращается SolverResult, предупреждение не печатается
+    a = np.asarray(a, dtype=float)
+    if np.any(a < 0):
+        raise ValueError("Корень из отрицательного числа")
+
+    def heron(x):
+        return 0.5 * (x + np.divide(a, x, out=np.zeros_like(x), where=x != 0))
+    # rtol - чтобы для больших a критерий не требовал точности выше машинной
+    return fixed_point(heron, sqrt_initial_guess(a), tol, max_iter, rtol=4 * np.finfo(float).eps,
+                       callback=callback, return_result=return_result)
+
+
+if __name__ == "__main__":
+    a = 5
+    result = sqrt_a(a)
+    if result is not None:
+        print(f"sqrt{a} = {result}")
+    print(sqrt_a([0.0, 2.0, 1e-300, 1e300], return_result=True))
+
+    # Линейно сходящаяся скалярная задача x = cos(x)
+    for method in ('plain', 'steffensen'):
+        print(method, fixed_point(np.cos, 1.0, method=method, return_result=True))
 
-a = 5
-result = sqrt_a(a)
-if result is not None:
-    print(f"sqrt{a} = {result}")
+    # Векторная задача x = M x + c, M симметричная со спектральным радиусом 0.97
+    rng = np.random.default_rng(0)
+    n = 200
+    M = rng.standard_normal((n, n))
+    M = M + M.T
+    M *= 0.97 / np.max(np.abs(np.linalg.eigvals(M)))
+    c = rng.standard_normal(n)
+    for method in ('plain', 'anderson'):
+        result = fixed_point(lambda x: M @ x + c, np.zeros(n), method=method, max_iterations=5000,
+                             return_result=True)
+        print(method, result.iterations, result.status,
+              np.abs(result.value - np.linalg.solve(np.eye(n) - M, c)).max())
@@ -0,0 +1,67 @@
+import time
+
+# Коды завершения итерационных методов
+STATUS_CONVERGED = 0
+STATUS_MAX_ITERATIONS = 1
+STATUS_ZERO_DERIVATIVE = 2
+STATUS_DIVERGED = 3
+STATUS_NO_SIGN_CHANGE = 4
+
+STATUS_NAMES = {
+    STATUS_CONVERGED: 'converged',
+    STATUS_MAX_ITERATIONS: 'max_iterations',
+    STATUS_ZERO_DERIVATIVE: 'zero_derivative',
+    STATUS_DIVERGED: 'diverged',
+    STATUS_NO_SIGN_CHANGE: 'no_sign_change',
+}
+
+
+class SolverResult:
+    """
+    Результат итерационного метода (возвращается при return_result=True).
+
+    Атрибуты:
+    - value: то, что метод возвращает без return_result (корень, (lambda, v), ...)
+    - iterations: количество выполненных итераций
+    - n_evaluations: количество вычислений функции/оператора (None, если не применимо)
+    - history: величина, сравниваемая с критерием остановки, на каждой итерации
+    - time: время работы метода в секундах
+    - status: код завершения STATUS_*
+    - message: описание причины остановки при неудаче
+    """
+
+    def __init__(self, value, iterations, n_evaluations, history, start, status=STATUS_CONVERGED, message=''):
+        self.value = value
+        self.iterations = iterations
+        self.n_evaluations = n_evaluations
+        self.history = history
+        self.time = time.perf_counter() - start
+        self.status = status
+        self.message = message
+
+    @property
+    def converged(self):
+        return self.status == STATUS_CONVERGED
+
+    def __repr__(self):
+        return (f"SolverResult(value={self.value!r}, iterations={self.iterations}, "
+                f"n_evaluations={self.n_evaluations}, time={self.time:.3g}, "
+                f"status={STATUS_NAMES.get(self.status, self.status)!r})")
+
+
+def make_observer(callback=None, history=None):
+    """
+    Функция observe(iteration, x, residual), которую метод вызывает на каждой итерации:
+    дописывает residual в history и передает метрики в callback(iteration, x, residual).
+    Если ни history, ни callback не заданы, возвращает None - метод тогда не тратит
+    на наблюдение ничего, кроме одной проверки за итерацию.
+    """
+    if callback is None and history is None:
+        return None
+
+    def observe(iteration, x, residual):
+        if history is not None:
+            history.append(residual)
+        if callback is not None:
+            callback(iteration, x, residual)
+    return observe
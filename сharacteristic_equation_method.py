@@ -1,5 +1,7 @@
 import numpy as np
 
+from parallel import parallel_map, spawn_seeds
+
 def gaussian_elimination(A, b):
     """
     Решает систему линейных уравнений Ax = b с помощью метода Гаусса.
@@ -10,9 +12,12 @@ def gaussian_elimination(A, b):
     
     Возвращает:
     - numpy.ndarray: Решение системы
+
+    Для стопки независимых систем см. gaus_simple_iteration.batch_solve.
     """
     n = len(b)
     M = A.copy()
+    b = np.array(b, dtype=float)  # не изменяем вектор вызывающего
     i = 0
     j = 0
 
@@ -45,32 +50,169 @@ def gaussian_elimination(A, b):
     return x
 
 
-def find_eigenvectors(matrix, eigenvalues):
+def hessenberg(matrix):
+    """
+    Приводит матрицу к форме Хессенберга отражениями Хаусхолдера: matrix = Q H Q^H.
+    Для симметричной матрицы H получается трехдиагональной.
+    Используется блочная реализация LAPACK (scipy.linalg.hessenberg, загружается
+    при первом вызове); без scipy - отражения по одному столбцу на NumPy.
+
+    Возвращает:
+    - H (numpy.ndarray): Верхняя матрица Хессенберга
+    - Q (numpy.ndarray): Ортогональная (унитарная) матрица преобразования
+    """
+    H = np.array(matrix, dtype=complex if np.iscomplexobj(matrix) else float)
+    try:
+        from scipy.linalg import hessenberg as lapack_hessenberg
+    except ImportError:
+        return _hessenberg_householder(H)
+    return lapack_hessenberg(H, calc_q=True, overwrite_a=True)
+
+
+def _hessenberg_householder(H):
+    """Приведение к форме Хессенберга на месте по одному отражению на столбец, O(n^3) операций NumPy."""
+    n = len(H)
+    Q = np.eye(n, dtype=H.dtype)
+    for k in range(n - 2):
+        x = H[k + 1:, k]
+        alpha = np.linalg.norm(x)
+        if alpha == 0:
+            continue
+        v = x.copy()
+        v[0] += (x[0] / abs(x[0]) if x[0] != 0 else 1) * alpha
+        v /= np.linalg.norm(v)
+        H[k + 1:, k:] -= 2 * np.outer(v, v.conj() @ H[k + 1:, k:])
+        H[:, k + 1:] -= 2 * np.outer(H[:, k + 1:] @ v, v.conj())
+        Q[:, k + 1:] -= 2 * np.outer(Q[:, k + 1:] @ v, v.conj())
+    return H, Q
+
+
+def _hessenberg_lu(H, shifts, tiny):
+    """
+    LU-разложение с выбором главного элемента сразу для пачки матриц H - shift I.
+    В матрице Хессенберга под диагональю один элемент, поэтому на шаге k
+    выбор идет только между текущей строкой и строкой k + 1 матрицы H, и
+    разложение стоит O(n^2) на каждый сдвиг. Нулевые главные элементы заменяются на tiny.
+    """
+    n = len(H)
+    dtype = np.result_type(H, shifts)
+    U = np.zeros((len(shifts), n, n), dtype=dtype)
+    L = np.zeros((len(shifts), max(n - 1, 0)), dtype=dtype)
+    swaps = np.zeros((len(shifts), max(n - 1, 0)), dtype=bool)
+
+    # Текущая (еще не закрепленная) строка k
+    current = np.repeat(H[None, 0], len(shifts), axis=0).astype(dtype)
+    current[:, 0] -= shifts
+    for k in range(n - 1):
+        following = np.repeat(H[None, k + 1, k:], len(shifts), axis=0).astype(dtype)
+        following[:, 1] -= shifts
+        swap = np.abs(following[:, 0]) > np.abs(current[:, k])
+        top = np.where(swap[:, None], following, current[:, k:])
+        bottom = np.where(swap[:, None], current[:, k:], following)
+        top[:, 0] = np.where(np.abs(top[:, 0]) < tiny, tiny, top[:, 0])
+        U[:, k, k:] = top
+        L[:, k] = bottom[:, 0] / top[:, 0]
+        current[:, k:] = bottom - L[:, k, None] * top
+        swaps[:, k] = swap
+    last = current[:, n - 1]
+    U[:, n - 1, n - 1] = np.where(np.abs(last) < tiny, tiny, last)
+    return U, L, swaps
+
+
+def _hessenberg_lu_solve(U, L, swaps, Y):
+    """Решает (H - shift I) x = y для всей пачки по разложению _hessenberg_lu."""
+    Y = Y.astype(U.dtype)
+    n = U.shape[1]
+    rows = np.arange(len(Y))
+    for k in range(n - 1):
+        swapped = rows[swaps[:, k]]
+        Y[swapped, k], Y[swapped, k + 1] = Y[swapped, k + 1], Y[swapped, k].copy()
+        Y[:, k + 1] -= L[:, k] * Y[:, k]
+    X = np.zeros_like(Y)
+    for i in range(n - 1, -1, -1):
+        X[:, i] = (Y[:, i] - np.einsum('bj,bj->b', U[:, i, i + 1:], X[:, i + 1:])) / U[:, i, i]
+    return X
+
+
+def _inverse_iteration_batch(task):
+    """Обратные итерации для одной пачки сдвигов (задача для parallel_map)."""
+    H, shifts, tiny, iterations, seed = task
+    U, L, swaps = _hessenberg_lu(H, shifts, tiny)
+    y = np.random.default_rng(seed).standard_normal((len(shifts), len(H)))
+    for _ in range(iterations):
+        y = _hessenberg_lu_solve(U, L, swaps, y)
+        y /= np.linalg.norm(y, axis=1, keepdims=True)
+    return y
+
+
+def find_eigenvectors(matrix, eigenvalues, iterations=2, batch_size=None, seed=0, workers=1):
     """
-    Находит собственные векторы n x n матрицы для данного собственного значения.
+    Находит собственные векторы n x n матрицы для данных собственных значений
+    обратными итерациями со сдвигом.
+
+    Матрица один раз приводится к форме Хессенберга, после чего каждое собственное
+    значение обрабатывается за O(n^2); значения обрабатываются пачками по batch_size.
+    Для кратных собственных значений берутся разные начальные векторы,
+    и полученные векторы ортогонализуются.
     
     Параметры:
     - matrix (numpy.ndarray): n x n матрица
-    - eigenvalues (numpy.ndarray): Собственные значения матрицы
+    - eigenvalues (numpy.ndarray): Собственные значения матрицы (могут быть комплексными)
+    - iterations (int): Количество обратных итераций на каждое значение
+    - batch_size (int): Сколько значений обрабатывается одновременно (по умолчанию
+      столько, чтобы разложения пачки занимали около 128 МБ, но не меньше 8)
+    - seed (int): Зерно генератора начальных векторов
+    - workers (int): Количество потоков для пачек (None - все ядра)
     
     Возвращает:
-    - numpy.ndarray: Собственные векторы матрицы
+    - numpy.ndarray: Собственные векторы матрицы (по строкам)
     """
-    eigenvectors = []
-    
-    for lambda_ in eigenvalues:
-        # For each eigenvalue, compute the eigenvector using Gaussian elimination
-        A_minus_lambdaI = matrix - lambda_ * np.identity(len(matrix))
-        b = np.zeros(len(matrix))
-        b[-1] = 1
-        eigenvector = gaussian_elimination(A_minus_lambdaI, b)
-        eigenvector[-1] = 1
-        
-        # Normalize the eigenvector
-        eigenvector = eigenvector / np.linalg.norm(eigenvector)
-        eigenvectors.append(eigenvector)
-    
-    return np.array(eigenvectors)
+    eigenvalues = np.asarray(eigenvalues)
+    if np.iscomplexobj(eigenvalues) and np.all(eigenvalues.imag == 0):
+        eigenvalues = eigenvalues.real
+    H, Q = hessenberg(matrix)
+    n = len(H)
+    norm = np.linalg.norm(H, 1)
+    tiny = np.finfo(float).eps * (norm or 1.0)
+
+    # Для вещественной матрицы вектор сопряженного значения - сопряженный вектор
+    mirror = {}
+    if not np.iscomplexobj(H):
+        upper = np.flatnonzero(eigenvalues.imag > 0)
+        for i in np.flatnonzero(eigenvalues.imag < 0):
+            if upper.size:
+                j = upper[np.argmin(np.abs(eigenvalues[upper] - np.conj(eigenvalues[i])))]
+                if abs(eigenvalues[j] - np.conj(eigenvalues[i])) <= 1e-8 * max(norm, 1.0):
+                    mirror[i] = j
+    computed = np.array([i for i in range(len(eigenvalues)) if i not in mirror], dtype=int)
+
+    Y = np.zeros((len(eigenvalues), n), dtype=np.result_type(H, eigenvalues))
+    if batch_size is None:
+        # Каждое значение пачки хранит треугольный множитель U размера n x n
+        batch_size = max(8, 2 ** 27 // max(n * n * Y.itemsize, 1))
+    batches = [computed[start:start + batch_size] for start in range(0, len(computed), batch_size)]
+    seeds = spawn_seeds(seed, len(batches))
+    tasks = [(H, eigenvalues[batch], tiny, iterations, batch_seed) for batch, batch_seed in zip(batches, seeds)]
+    for batch, y in zip(batches, parallel_map(_inverse_iteration_batch, tasks, workers)):
+        Y[batch] = y
+
+    # Кратные собственные значения: ортогонализация векторов внутри группы
+    values = eigenvalues[computed]
+    close = np.abs(values[:, None] - values[None, :]) <= 1e-8 * max(norm, 1.0)
+    first = np.argmax(close, axis=1)
+    for group in np.unique(first):
+        members = computed[first == group]
+        if len(members) > 1:
+            Y[members] = np.linalg.qr(Y[members].T)[0].T
+    for i, j in mirror.items():
+        Y[i] = np.conj(Y[j])
+
+    eigenvectors = Y @ Q.T
+    eigenvectors /= np.linalg.norm(eigenvectors, axis=1, keepdims=True)
+    # Нормировка знака (фазы): наибольшая по модулю компонента положительна
+    largest = eigenvectors[np.arange(len(eigenvectors)), np.argmax(np.abs(eigenvectors), axis=1)]
+    eigenvectors *= (np.abs(largest) / largest)[:, None]
+    return eigenvectors
 
 
 def find_eigenvalues_and_eigenvectors(matrix):
@@ -89,13 +231,14 @@ def find_eigenvalues_and_eigenvectors(matrix):
     return eigenvalues, eigenvectors
 
 
-# Testing
-matrix_test = np.array([[2, -1, 0], 
-                        [-1, 2, -1], 
-                        [0, -1, 2]])
-eigenvalues_test, eigenvectors_test = find_eigenvalues_and_eigenvectors(matrix_test)
+if __name__ == "__main__":
+    # Testing
+    matrix_test = np.array([[2, -1, 0], 
+                            [-1, 2, -1], 
+                            [0, -1, 2]])
+    eigenvalues_test, eigenvectors_test = find_eigenvalues_and_eigenvectors(matrix_test)
 
-# Comparing with numpy's results
-eigenvalues_np, eigenvectors_np = np.linalg.eig(matrix_test)
+    # Comparing with numpy's results
+    eigenvalues_np, eigenvectors_np = np.linalg.eig(matrix_test)
 
-print(eigenvalues_test, eigenvectors_test, eigenvalues_np, eigenvectors_np)
+    print(eigenvalues_test, eigenvectors_test, eigenvalues_np, eigenvectors_np)